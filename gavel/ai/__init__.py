@@ -1,6 +1,11 @@
 """AI integration modules for Gavel"""
 
-from gavel.ai.openrouter import verify_with_openrouter
-from gavel.ai.anthropic import verify_with_anthropic
+from gavel.ai.openrouter import verify_with_openrouter, averify_with_openrouter
+from gavel.ai.anthropic import verify_with_anthropic, averify_with_anthropic
 
-__all__ = ["verify_with_openrouter", "verify_with_anthropic"]
+__all__ = [
+    "verify_with_openrouter",
+    "averify_with_openrouter",
+    "verify_with_anthropic",
+    "averify_with_anthropic",
+]
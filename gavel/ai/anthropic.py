@@ -1,13 +1,42 @@
 """Anthropic API integration with batch support"""
 
+import functools
 import os
-from typing import Optional
-from anthropic import Anthropic
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from anthropic import Anthropic, AsyncAnthropic, Timeout
 from gavel.models import VerificationResult
-from gavel.ai.prompts import build_verification_prompt, parse_verdict
+from gavel.ai.prompts import build_verification_prompt_parts, parse_verdict, is_verdict_complete
+from gavel.ai.ratelimit import get_limiter
+from gavel.ai.retry import retry_transient
+from gavel.tools.optimizer import estimate_tokens
 from gavel.utils.security import sanitize_ai_output
 
 
+# Map short model names to full model IDs
+_MODEL_MAP = {
+    "opus-4.5": "claude-opus-4-20250514",
+    "sonnet-4.5": "claude-sonnet-4-20250514",
+}
+
+_DEFAULT_MODEL_ID = "claude-opus-4-20250514"
+
+# Fail fast on connect, but leave room for long generations
+_TIMEOUT = Timeout(120.0, connect=10.0)
+
+# Batch results are post-processed in worker processes from this many on;
+# below it the pool's startup cost outweighs the parallel speedup
+POSTPROCESS_POOL_MIN = 8
+
+
+@functools.lru_cache(maxsize=4)
+def _client(api_key: str) -> Anthropic:
+    """Get a shared client for api_key so keep-alive connections are reused across calls"""
+    # Retries come from retry_transient; SDK retries would multiply its attempts
+    return Anthropic(api_key=api_key, max_retries=0, timeout=_TIMEOUT)
+
+
 def verify_with_anthropic(
     report: str,
     code_context: str,
@@ -28,26 +57,115 @@ def verify_with_anthropic(
     Returns:
         VerificationResult
     """
+    client = _client(_get_api_key())
+
+    request = _build_request(report, code_context, model, generate_poc, verbose)
+
+    # Make API call
+    try:
+        response_text = _stream_text(client, request, stop_early=not generate_poc)
+        return _result_from_response(response_text, model, generate_poc, verbose)
+
+    except Exception as e:
+        if verbose:
+            print(f"Error calling Anthropic API: {e}")
+        raise
+
+
+async def averify_with_anthropic(
+    report: str,
+    code_context: str,
+    model: str = "opus-4.5",
+    generate_poc: bool = False,
+    verbose: bool = False,
+    client: Optional[AsyncAnthropic] = None
+) -> VerificationResult:
+    """
+    Async variant of verify_with_anthropic
+
+    Args:
+        report: Vulnerability report content
+        code_context: Relevant code context
+        model: Model to use ("opus-4.5" or "sonnet-4.5")
+        generate_poc: Whether to generate a PoC
+        verbose: Enable verbose logging
+        client: Shared AsyncAnthropic client (one is created if omitted)
+
+    Returns:
+        VerificationResult
+    """
+    if client is None:
+        client = AsyncAnthropic(api_key=_get_api_key(), max_retries=0, timeout=_TIMEOUT)
+
+    request = _build_request(report, code_context, model, generate_poc, verbose)
+
+    try:
+        response_text = await _astream_text(client, request, stop_early=not generate_poc)
+        return _result_from_response(response_text, model, generate_poc, verbose)
+
+    except Exception as e:
+        if verbose:
+            print(f"Error calling Anthropic API: {e}")
+        raise
+
+
+@retry_transient
+def _stream_text(client: Anthropic, request: Dict[str, Any], stop_early: bool) -> str:
+    """
+    Stream a messages request and return the response text, retrying
+    rate limits, overloads and connection errors
+
+    With stop_early the stream is closed as soon as the verdict and
+    reasoning have arrived, skipping the rest of the generation.
+    """
+    response_text = ""
+    with client.messages.stream(**request) as stream:
+        for text in stream.text_stream:
+            response_text += text
+            if stop_early and is_verdict_complete(response_text):
+                break
+    return response_text
+
+
+@retry_transient
+async def _astream_text(client: AsyncAnthropic, request: Dict[str, Any], stop_early: bool) -> str:
+    """Async variant of _stream_text that also waits on the shared rate limiter"""
+    blocks = request["system"] + request["messages"][0]["content"]
+    prompt = "".join(block["text"] for block in blocks)
+    await get_limiter().acquire(estimate_tokens(prompt) + request["max_tokens"])
+
+    response_text = ""
+    async with client.messages.stream(**request) as stream:
+        async for text in stream.text_stream:
+            response_text += text
+            if stop_early and is_verdict_complete(response_text):
+                break
+    return response_text
+
+
+def _get_api_key() -> str:
+    """Read the Anthropic API key from the environment"""
     api_key = os.getenv("ANTHROPIC_API_KEY")
     if not api_key:
         raise ValueError("ANTHROPIC_API_KEY not found in environment")
+    return api_key
 
-    # Map short model names to full model IDs
-    model_map = {
-        "opus-4.5": "claude-opus-4-20250514",
-        "sonnet-4.5": "claude-sonnet-4-20250514",
-    }
 
-    model_id = model_map.get(model, "claude-opus-4-20250514")
+def _build_request(
+    report: str,
+    code_context: str,
+    model: str,
+    generate_poc: bool,
+    verbose: bool
+) -> Dict[str, Any]:
+    """Build keyword arguments for messages.create"""
+    model_id = _MODEL_MAP.get(model, _DEFAULT_MODEL_ID)
 
     if verbose:
         print(f"Using Anthropic model: {model_id}")
 
-    # Initialize client
-    client = Anthropic(api_key=api_key)
-
     # Build prompt
-    system_prompt, user_prompt = build_verification_prompt(
+    system_prompt, context_prompt, report_prompt = build_verification_prompt_parts(
         report=report,
         code_context=code_context,
         generate_poc=generate_poc
@@ -55,55 +173,91 @@ def verify_with_anthropic(
 
     if verbose:
         print(f"Sending request to Anthropic API...")
-        print(f"Prompt length: {len(user_prompt)} characters")
+        print(f"Prompt length: {len(context_prompt) + len(report_prompt)} characters")
 
-    # Make API call
-    try:
-        response = client.messages.create(
-            model=model_id,
-            max_tokens=2048 if not generate_poc else 4096,
-            temperature=0.1,  # Low temperature for consistent, factual responses
-            system=system_prompt,
-            messages=[
-                {
-                    "role": "user",
-                    "content": user_prompt
-                }
-            ]
-        )
-
-        # Extract response
-        response_text = response.content[0].text
+    return {
+        "model": model_id,
+        "max_tokens": 2048 if not generate_poc else 4096,
+        "temperature": 0.1,  # Low temperature for consistent, factual responses
+        # Mark the system prompt cacheable so it is reused server-side across calls
+        "system": [
+            {
+                "type": "text",
+                "text": system_prompt,
+                "cache_control": {"type": "ephemeral"}
+            }
+        ],
+        "messages": [
+            {
+                "role": "user",
+                "content": [
+                    # Code context is shared by reports against the same
+                    # codebase, so it is cached as a prefix before the report
+                    {
+                        "type": "text",
+                        "text": context_prompt,
+                        "cache_control": {"type": "ephemeral"}
+                    },
+                    {
+                        "type": "text",
+                        "text": report_prompt
+                    }
+                ]
+            }
+        ],
+    }
 
-        if verbose:
-            print(f"Received response from Anthropic API")
-            print(f"Response length: {len(response_text)} characters")
 
-        # Sanitize output to prevent system prompt leakage (defense in depth)
-        response_text = sanitize_ai_output(response_text, strict=True)
+def _result_from_response(
+    response_text: str,
+    model: str,
+    generate_poc: bool,
+    verbose: bool
+) -> VerificationResult:
+    """Sanitize and parse a raw model response into a VerificationResult"""
+    if verbose:
+        print(f"Received response from Anthropic API")
+        print(f"Response length: {len(response_text)} characters")
+
+    verdict, reasoning, poc = _postprocess(response_text)
+    return _make_result(verdict, reasoning, poc, model, generate_poc)
 
-        if verbose:
-            print(f"Sanitized response length: {len(response_text)} characters")
 
-        # Parse verdict and reasoning
-        verdict, reasoning, poc = parse_verdict(response_text)
+def _postprocess(response_text: str) -> Tuple[str, str, Optional[str]]:
+    """
+    Sanitize a raw model response and parse it into (verdict, reasoning, poc)
 
-        # Additional sanitization on extracted components
-        reasoning = sanitize_ai_output(reasoning, strict=True)
-        if poc:
-            poc = sanitize_ai_output(poc, strict=False)  # Less strict for PoC code
+    Kept at module level so it can run in a worker process.
+    """
+    # Sanitize output to prevent system prompt leakage (defense in depth).
+    # Reasoning and PoC are parsed out of the sanitized text, so they need
+    # no second pass (the strict pass covers everything strict=False does)
+    return parse_verdict(sanitize_ai_output(response_text, strict=True))
 
-        return VerificationResult(
-            verdict=verdict,
-            reasoning=reasoning,
-            confidence="high" if "opus" in model else "medium",
-            poc=poc if generate_poc else None
-        )
 
-    except Exception as e:
-        if verbose:
-            print(f"Error calling Anthropic API: {e}")
-        raise
+def _postprocess_all(response_texts: List[str]) -> List[Tuple[str, str, Optional[str]]]:
+    """Run _postprocess over many responses, spreading large batches across CPU cores"""
+    if len(response_texts) < POSTPROCESS_POOL_MIN:
+        return [_postprocess(text) for text in response_texts]
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+        return list(pool.map(_postprocess, response_texts, chunksize=8))
+
+
+def _make_result(
+    verdict: str,
+    reasoning: str,
+    poc: Optional[str],
+    model: str,
+    generate_poc: bool
+) -> VerificationResult:
+    """Build the VerificationResult for a parsed response"""
+    return VerificationResult(
+        verdict=verdict,
+        reasoning=reasoning,
+        confidence="high" if "opus" in model else "medium",
+        poc=poc if generate_poc else None
+    )
 
 
 def verify_with_anthropic_batch(
@@ -126,9 +280,7 @@ def verify_with_anthropic_batch(
 
     Note: This uses Anthropic's batch API for reduced costs
     """
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    if not api_key:
-        raise ValueError("ANTHROPIC_API_KEY not found in environment")
+    api_key = _get_api_key()
 
     # Check if batch mode is enabled
     use_batch = os.getenv("ENABLE_BATCH_REQUESTS", "true").lower() == "true"
@@ -150,20 +302,54 @@ def verify_with_anthropic_batch(
     if verbose:
         print(f"Using Anthropic Batch API for {len(reports_and_contexts)} requests")
 
-    # TODO: Implement batch API when available
-    # For now, fall back to sequential processing
-    results = []
-    for i, (report, context) in enumerate(reports_and_contexts):
+    # The batch calls are not wrapped in retry_transient, so let the SDK
+    # retry them (same connection pool, per-call option)
+    client = _client(api_key).with_options(max_retries=2)
+
+    batch = client.messages.batches.create(
+        requests=[
+            {
+                "custom_id": f"r{i}",
+                "params": _build_request(report, context, model, generate_poc, verbose=False),
+            }
+            for i, (report, context) in enumerate(reports_and_contexts)
+        ]
+    )
+
+    # Poll with exponential backoff until the batch has finished processing
+    attempts = 0
+    while batch.processing_status != "ended":
+        time.sleep(min(30, 2 ** attempts))
+        attempts += 1
+        batch = client.messages.batches.retrieve(batch.id)
+
         if verbose:
-            print(f"Processing batch item {i+1}/{len(reports_and_contexts)}")
-
-        result = verify_with_anthropic(
-            report=report,
-            code_context=context,
-            model=model,
-            generate_poc=generate_poc,
-            verbose=verbose
-        )
-        results.append(result)
+            counts = batch.request_counts
+            print(f"Batch {batch.id}: {counts.processing} processing, {counts.succeeded} succeeded")
+
+    succeeded: Dict[int, str] = {}
+    for entry in client.messages.batches.results(batch.id):
+        i = int(entry.custom_id[1:])
+        if entry.result.type == "succeeded":
+            succeeded[i] = entry.result.message.content[0].text
+        elif verbose:
+            print(f"Batch item {i+1} {entry.result.type}, retrying individually")
+
+    # Sanitizing and parsing is CPU-bound, so large batches use all cores
+    results: List[Optional[VerificationResult]] = [None] * len(reports_and_contexts)
+    parsed = _postprocess_all(list(succeeded.values()))
+    for i, (verdict, reasoning, poc) in zip(succeeded, parsed):
+        results[i] = _make_result(verdict, reasoning, poc, model, generate_poc)
+
+    # Items that errored, expired or were canceled are retried as single requests
+    for i, (report, context) in enumerate(reports_and_contexts):
+        if results[i] is None:
+            results[i] = verify_with_anthropic(
+                report=report,
+                code_context=context,
+                model=model,
+                generate_poc=generate_poc,
+                verbose=verbose
+            )
 
     return results
@@ -1,13 +1,62 @@
 """OpenRouter API integration"""
 
+import atexit
+import functools
 import os
-import requests
-from typing import Optional
+import httpx
+from typing import Any, Dict, Optional, Tuple
 from gavel.models import VerificationResult
-from gavel.ai.prompts import build_verification_prompt, parse_verdict
+from gavel.ai.prompts import SYSTEM_PROMPT, build_verification_prompt, parse_verdict
+from gavel.ai.ratelimit import get_limiter
+from gavel.ai.retry import retry_transient
+from gavel.tools.optimizer import estimate_tokens, truncate_to_tokens
+from gavel.utils import jsonio
 from gavel.utils.security import sanitize_ai_output
 
 
+OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+
+# Token budget for a whole request, prompt plus completion (safe limit for most models)
+MAX_CONTEXT_TOKENS = 50000
+
+# Fixed instructions wrapped around the report and code context
+PROMPT_OVERHEAD_TOKENS = 250
+
+# Fail fast on connect, but leave room for long generations
+_TIMEOUT = httpx.Timeout(120.0, connect=10.0)
+
+# Map short model names to OpenRouter model IDs
+_MODEL_MAP = {
+    "opus-4.5": "anthropic/claude-opus-4.5:beta",
+    "sonnet-4.5": "anthropic/claude-sonnet-4.5:beta",
+}
+
+_DEFAULT_MODEL_ID = "anthropic/claude-opus-4.5:beta"
+
+
+@functools.lru_cache(maxsize=1)
+def _client() -> httpx.Client:
+    """Lazily create the shared HTTP/2 client so connections are reused across calls"""
+    client = httpx.Client(
+        http2=True,
+        timeout=_TIMEOUT,
+        limits=httpx.Limits(max_keepalive_connections=64, max_connections=128)
+    )
+    atexit.register(client.close)
+    return client
+
+
+@functools.lru_cache(maxsize=4)
+def _headers(api_key: str) -> Dict[str, str]:
+    """Request headers for api_key (built once; treat as read-only)"""
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+        "HTTP-Referer": "https://github.com/yourusername/gavel",  # Update with actual repo
+        "X-Title": "Gavel",
+    }
+
+
 def verify_with_openrouter(
     report: str,
     code_context: str,
@@ -28,21 +77,131 @@ def verify_with_openrouter(
     Returns:
         VerificationResult
     """
+    headers, payload = _build_request(report, code_context, model, generate_poc, verbose)
+
+    try:
+        result = _post(headers, payload)
+        return _result_from_response(result, model, generate_poc, verbose)
+
+    except httpx.HTTPError as e:
+        if verbose:
+            print(f"Error calling OpenRouter API: {e}")
+        raise
+    except Exception as e:
+        if verbose:
+            print(f"Error processing OpenRouter response: {e}")
+        raise
+
+
+async def averify_with_openrouter(
+    report: str,
+    code_context: str,
+    model: str = "opus-4.5",
+    generate_poc: bool = False,
+    verbose: bool = False,
+    client: Optional[httpx.AsyncClient] = None
+) -> VerificationResult:
+    """
+    Async variant of verify_with_openrouter
+
+    Args:
+        report: Vulnerability report content
+        code_context: Relevant code context
+        model: Model to use ("opus-4.5" or "sonnet-4.5")
+        generate_poc: Whether to generate a PoC
+        verbose: Enable verbose logging
+        client: Shared httpx.AsyncClient (a temporary one is used if omitted)
+
+    Returns:
+        VerificationResult
+    """
+    headers, payload = _build_request(report, code_context, model, generate_poc, verbose)
+
+    try:
+        if client is None:
+            async with httpx.AsyncClient(http2=True, timeout=_TIMEOUT) as own_client:
+                result = await _apost(own_client, headers, payload)
+        else:
+            result = await _apost(client, headers, payload)
+
+        return _result_from_response(result, model, generate_poc, verbose)
+
+    except httpx.HTTPError as e:
+        if verbose:
+            print(f"Error calling OpenRouter API: {e}")
+        raise
+    except Exception as e:
+        if verbose:
+            print(f"Error processing OpenRouter response: {e}")
+        raise
+
+
+@retry_transient
+def _post(headers: Dict[str, str], payload: Dict[str, Any]) -> Dict[str, Any]:
+    """POST a chat completions request and decode the reply, retrying transient failures"""
+    response = _client().post(OPENROUTER_URL, headers=headers, content=jsonio.dumps_bytes(payload))
+    response.raise_for_status()
+    return jsonio.loads(response.content)
+
+
+@retry_transient
+async def _apost(
+    client: httpx.AsyncClient,
+    headers: Dict[str, str],
+    payload: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Async variant of _post that also waits on the shared rate limiter"""
+    await get_limiter().acquire(
+        estimate_tokens(payload["messages"][0]["content"]) + payload["max_tokens"]
+    )
+
+    response = await client.post(
+        OPENROUTER_URL, headers=headers, content=jsonio.dumps_bytes(payload), timeout=_TIMEOUT
+    )
+    response.raise_for_status()
+    return jsonio.loads(response.content)
+
+
+def _build_request(
+    report: str,
+    code_context: str,
+    model: str,
+    generate_poc: bool,
+    verbose: bool
+) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    """Build (headers, payload) for a chat completions request"""
     api_key = os.getenv("OPENROUTER_API_KEY")
     if not api_key:
         raise ValueError("OPENROUTER_API_KEY not found in environment")
 
-    # Map short model names to OpenRouter model IDs
-    model_map = {
-        "opus-4.5": "anthropic/claude-opus-4.5:beta",
-        "sonnet-4.5": "anthropic/claude-sonnet-4.5:beta",
-    }
-
-    model_id = model_map.get(model, "anthropic/claude-opus-4.5:beta")
+    model_id = _MODEL_MAP.get(model, _DEFAULT_MODEL_ID)
 
     if verbose:
         print(f"Using OpenRouter model: {model_id}")
 
+    max_tokens = 2048 if not generate_poc else 4096
+
+    # Budget the code context in tokens, reserving room for the completion,
+    # the system prompt, the report and the fixed prompt text
+    budget = (
+        MAX_CONTEXT_TOKENS
+        - max_tokens
+        - estimate_tokens(SYSTEM_PROMPT)
+        - estimate_tokens(report)
+        - PROMPT_OVERHEAD_TOKENS
+    )
+    if estimate_tokens(code_context) > budget:
+        if verbose:
+            print(f"Warning: Code context too large (~{estimate_tokens(code_context)} tokens), truncating to ~{max(budget, 0)} tokens")
+
+        if budget > 0:
+            # Keep the front of the context where imports and definitions live
+            code_context = truncate_to_tokens(code_context, budget, strategy="back")
+            code_context += "\n\n... (code context truncated due to size limits)"
+        else:
+            # If even that's too large, just use the report without code context
+            code_context = ""
+
     # Build prompt
     system_prompt, user_prompt = build_verification_prompt(
         report=report,
@@ -53,42 +212,11 @@ def verify_with_openrouter(
     # Combine system and user prompts for OpenRouter
     full_prompt = f"{system_prompt}\n\n{user_prompt}"
 
-    # Enforce maximum prompt size to prevent 400 errors
-    MAX_PROMPT_SIZE = 200000  # ~50k tokens (safe limit for most models)
-    if len(full_prompt) > MAX_PROMPT_SIZE:
-        if verbose:
-            print(f"Warning: Prompt too large ({len(full_prompt)} chars), truncating to {MAX_PROMPT_SIZE} chars")
-
-        # Truncate code context while preserving system prompt and report
-        available_space = MAX_PROMPT_SIZE - len(system_prompt) - len(report) - 1000  # Buffer
-        if available_space > 0:
-            truncated_context = code_context[:available_space] + "\n\n... (code context truncated due to size limits)"
-            _, user_prompt = build_verification_prompt(
-                report=report,
-                code_context=truncated_context,
-                generate_poc=generate_poc
-            )
-            full_prompt = f"{system_prompt}\n\n{user_prompt}"
-        else:
-            # If even that's too large, just use the report without code context
-            _, user_prompt = build_verification_prompt(
-                report=report,
-                code_context="",
-                generate_poc=generate_poc
-            )
-            full_prompt = f"{system_prompt}\n\n{user_prompt}"
-
     if verbose:
         print(f"Sending request to OpenRouter API...")
         print(f"Prompt length: {len(full_prompt)} characters")
 
-    # Make API call
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-        "HTTP-Referer": "https://github.com/yourusername/gavel",  # Update with actual repo
-        "X-Title": "Gavel",
-    }
+    headers = _headers(api_key)
 
     payload = {
         "model": model_id,
@@ -98,57 +226,44 @@ def verify_with_openrouter(
                 "content": full_prompt
             }
         ],
-        "max_tokens": 2048 if not generate_poc else 4096,
+        "max_tokens": max_tokens,
         "temperature": 0.1,
     }
 
-    try:
-        response = requests.post(
-            "https://openrouter.ai/api/v1/chat/completions",
-            headers=headers,
-            json=payload,
-            timeout=120
-        )
-
-        response.raise_for_status()
-        result = response.json()
-
-        # Extract response
-        if "choices" not in result or len(result["choices"]) == 0:
-            raise ValueError(f"Invalid response from OpenRouter: {result}")
+    return headers, payload
 
-        response_text = result["choices"][0]["message"]["content"]
 
-        if verbose:
-            print(f"Received response from OpenRouter API")
-            print(f"Response length: {len(response_text)} characters")
+def _result_from_response(
+    result: Dict[str, Any],
+    model: str,
+    generate_poc: bool,
+    verbose: bool
+) -> VerificationResult:
+    """Sanitize and parse a decoded OpenRouter response into a VerificationResult"""
+    # Extract response
+    if "choices" not in result or len(result["choices"]) == 0:
+        raise ValueError(f"Invalid response from OpenRouter: {result}")
 
-        # Sanitize output to prevent system prompt leakage (defense in depth)
-        response_text = sanitize_ai_output(response_text, strict=True)
+    response_text = result["choices"][0]["message"]["content"]
 
-        if verbose:
-            print(f"Sanitized response length: {len(response_text)} characters")
+    if verbose:
+        print(f"Received response from OpenRouter API")
+        print(f"Response length: {len(response_text)} characters")
 
-        # Parse verdict and reasoning
-        verdict, reasoning, poc = parse_verdict(response_text)
+    # Sanitize output to prevent system prompt leakage (defense in depth).
+    # Reasoning and PoC are parsed out of the sanitized text, so they need
+    # no second pass (the strict pass covers everything strict=False does)
+    response_text = sanitize_ai_output(response_text, strict=True)
 
-        # Additional sanitization on extracted components
-        reasoning = sanitize_ai_output(reasoning, strict=True)
-        if poc:
-            poc = sanitize_ai_output(poc, strict=False)  # Less strict for PoC code
+    if verbose:
+        print(f"Sanitized response length: {len(response_text)} characters")
 
-        return VerificationResult(
-            verdict=verdict,
-            reasoning=reasoning,
-            confidence="high" if "opus" in model else "medium",
-            poc=poc if generate_poc else None
-        )
+    # Parse verdict and reasoning
+    verdict, reasoning, poc = parse_verdict(response_text)
 
-    except requests.exceptions.RequestException as e:
-        if verbose:
-            print(f"Error calling OpenRouter API: {e}")
-        raise
-    except Exception as e:
-        if verbose:
-            print(f"Error processing OpenRouter response: {e}")
-        raise
+    return VerificationResult(
+        verdict=verdict,
+        reasoning=reasoning,
+        confidence="high" if "opus" in model else "medium",
+        poc=poc if generate_poc else None
+    )
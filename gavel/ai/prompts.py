@@ -4,6 +4,23 @@ import re
 from typing import Tuple, Optional
 
 
+# Patterns used by parse_verdict, compiled once at import
+_VERDICT_RE = re.compile(r"VERDICT\s*[:\-]?\s*(VALID|INVALID)", re.IGNORECASE)
+_LEAD_VALID_RE = re.compile(r"^\s*VALID", re.IGNORECASE)
+_LEAD_INVALID_RE = re.compile(r"^\s*INVALID", re.IGNORECASE)
+_REASONING_RE = re.compile(
+    r"REASONING\s*[:\-]?\s*(.+?)(?:\n\n|POC\s*[:\-]|$)",
+    re.IGNORECASE | re.DOTALL
+)
+# Reasoning followed by a blank line or PoC marker, i.e. no longer growing
+_REASONING_DONE_RE = re.compile(
+    r"REASONING\s*[:\-]?\s*.+?(?:\n\n|POC\s*[:\-])",
+    re.IGNORECASE | re.DOTALL
+)
+_POC_RE = re.compile(r"POC\s*[:\-]?\s*(.+)$", re.IGNORECASE | re.DOTALL)
+_SENT_RE = re.compile(r"[.!?]+")
+
+
 SYSTEM_PROMPT = """You are Gavel, an expert security researcher and code auditor specialized in verifying vulnerability reports.
 
 Your role is to analyze vulnerability reports against actual codebases and determine if the reported vulnerability is VALID or INVALID.
@@ -50,6 +67,25 @@ POC: [Proof of concept code or exploit steps]
 Be thorough but concise. Security researchers and developers depend on your accurate assessment."""
 
 
+# Fixed sections of the user prompt, assembled once at import
+_SEP = "=" * 60
+_INTRO = "Please verify the vulnerability report below against the provided codebase.\n\n"
+_HEADER_CODE = f"{_SEP}\nRELEVANT CODE FROM CODEBASE:\n{_SEP}\n\n"
+_HEADER_REPORT = f"\n\n{_SEP}\nVULNERABILITY REPORT:\n{_SEP}\n\n"
+_FOOTER_ANALYZE = (
+    f"\n\n{_SEP}\n\n"
+    "Analyze the code and determine if the vulnerability report is VALID or INVALID.\n"
+)
+_POC_LINE = "\nIf VALID, also provide a Proof of Concept (PoC) demonstrating the vulnerability.\n"
+_REMINDER = """
+Remember:
+- Output ONLY "VALID" or "INVALID"
+- Provide 1-2 sentence reasoning
+- Be skeptical of generic AI-generated reports
+- Verify that the code actually has the vulnerability described
+"""
+
+
 def build_verification_prompt(
     report: str,
     code_context: str,
@@ -66,37 +102,45 @@ def build_verification_prompt(
     Returns:
         Tuple of (system_prompt, user_prompt)
     """
-    user_prompt = f"""Please verify the following vulnerability report against the provided codebase.
+    system_prompt, context_prompt, report_prompt = build_verification_prompt_parts(
+        report=report,
+        code_context=code_context,
+        generate_poc=generate_poc
+    )
+    return system_prompt, context_prompt + report_prompt
 
-{'='*60}
-VULNERABILITY REPORT:
-{'='*60}
 
-{report}
+def build_verification_prompt_parts(
+    report: str,
+    code_context: str,
+    generate_poc: bool = False
+) -> Tuple[str, str, str]:
+    """
+    Build the prompts with the user prompt split at the report
 
-{'='*60}
-RELEVANT CODE FROM CODEBASE:
-{'='*60}
+    Stable content comes first (system prompt, then code context) so that
+    consecutive requests against the same codebase share a prompt prefix
+    that providers can cache.
 
-{code_context}
+    Args:
+        report: Vulnerability report content
+        code_context: Relevant code context
+        generate_poc: Whether to request PoC generation
 
-{'='*60}
+    Returns:
+        Tuple of (system_prompt, context_prompt, report_prompt); the user
+        prompt is context_prompt + report_prompt
+    """
+    context_prompt = "".join([_INTRO, _HEADER_CODE, code_context])
 
-Analyze the code and determine if the vulnerability report is VALID or INVALID.
-"""
+    parts = [_HEADER_REPORT, report, _FOOTER_ANALYZE]
 
     if generate_poc:
-        user_prompt += "\nIf VALID, also provide a Proof of Concept (PoC) demonstrating the vulnerability.\n"
+        parts.append(_POC_LINE)
 
-    user_prompt += """
-Remember:
-- Output ONLY "VALID" or "INVALID"
-- Provide 1-2 sentence reasoning
-- Be skeptical of generic AI-generated reports
-- Verify that the code actually has the vulnerability described
-"""
+    parts.append(_REMINDER)
 
-    return SYSTEM_PROMPT, user_prompt
+    return SYSTEM_PROMPT, context_prompt, "".join(parts)
 
 
 def parse_verdict(response: str) -> Tuple[str, str, Optional[str]]:
@@ -110,30 +154,22 @@ def parse_verdict(response: str) -> Tuple[str, str, Optional[str]]:
         Tuple of (verdict, reasoning, poc)
     """
     # Extract verdict
-    verdict_match = re.search(
-        r"VERDICT\s*[:\-]?\s*(VALID|INVALID)",
-        response,
-        re.IGNORECASE
-    )
+    verdict_match = _VERDICT_RE.search(response)
 
     if verdict_match:
         verdict = verdict_match.group(1).upper()
     else:
         # Fallback: look for VALID or INVALID at start of response
-        if re.match(r"^\s*VALID", response, re.IGNORECASE):
+        if _LEAD_VALID_RE.match(response):
             verdict = "VALID"
-        elif re.match(r"^\s*INVALID", response, re.IGNORECASE):
+        elif _LEAD_INVALID_RE.match(response):
             verdict = "INVALID"
         else:
             # If we can't determine, default to INVALID (conservative)
             verdict = "INVALID"
 
     # Extract reasoning
-    reasoning_match = re.search(
-        r"REASONING\s*[:\-]?\s*(.+?)(?:\n\n|POC\s*[:\-]|$)",
-        response,
-        re.IGNORECASE | re.DOTALL
-    )
+    reasoning_match = _REASONING_RE.search(response)
 
     if reasoning_match:
         reasoning = reasoning_match.group(1).strip()
@@ -152,18 +188,47 @@ def parse_verdict(response: str) -> Tuple[str, str, Optional[str]]:
         reasoning = " ".join(reasoning_lines) if reasoning_lines else "No reasoning provided"
 
     # Truncate reasoning to ~2 sentences
-    sentences = re.split(r'[.!?]+', reasoning)
-    reasoning = ". ".join([s.strip() for s in sentences[:2] if s.strip()])
+    reasoning = _first_two_sentences(reasoning)
     if reasoning and not reasoning.endswith("."):
         reasoning += "."
 
     # Extract PoC if present
-    poc_match = re.search(
-        r"POC\s*[:\-]?\s*(.+)$",
-        response,
-        re.IGNORECASE | re.DOTALL
-    )
+    poc_match = _POC_RE.search(response)
 
     poc = poc_match.group(1).strip() if poc_match else None
 
     return verdict, reasoning, poc
+
+
+def _first_two_sentences(text: str) -> str:
+    """Join the first two sentences of text with ". ", scanning no further than needed"""
+    pieces = []
+    start = 0
+
+    for match in _SENT_RE.finditer(text):
+        pieces.append(text[start:match.start()])
+        start = match.end()
+        if len(pieces) == 2:
+            break
+    else:
+        # Text after the last terminator counts as a sentence too
+        pieces.append(text[start:])
+
+    return ". ".join(piece.strip() for piece in pieces if piece.strip())
+
+
+def is_verdict_complete(partial_response: str) -> bool:
+    """
+    Check whether a (possibly still streaming) response already contains
+    the verdict and a finished reasoning section
+
+    Args:
+        partial_response: Response text received so far
+
+    Returns:
+        True if parse_verdict would not gain anything but the PoC from more text
+    """
+    return (
+        _VERDICT_RE.search(partial_response) is not None
+        and _REASONING_DONE_RE.search(partial_response) is not None
+    )
@@ -0,0 +1,85 @@
+"""Client-side rate limiting for AI provider calls"""
+
+import asyncio
+import functools
+import os
+import time
+
+
+class AsyncLimiter:
+    """
+    Token bucket limiting both requests per minute and tokens per minute
+
+    Both buckets refill continuously. A request waits until one request
+    slot and its estimated tokens are available, so a batch stays under
+    the provider limits instead of stalling on 429 retries.
+
+    The limiter never awaits between checking and consuming capacity, so
+    it is safe to share across tasks without a lock (and across event loops).
+    """
+
+    def __init__(self, rpm: float, tpm: float):
+        """
+        Args:
+            rpm: Requests allowed per minute (0 disables the request limit)
+            tpm: Tokens allowed per minute (0 disables the token limit)
+        """
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests_available = float(rpm)
+        self._tokens_available = float(tpm)
+        self._last_refill = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+
+        self._requests_available = min(
+            float(self.rpm), self._requests_available + elapsed * self.rpm / 60
+        )
+        self._tokens_available = min(
+            float(self.tpm), self._tokens_available + elapsed * self.tpm / 60
+        )
+
+    async def acquire(self, estimated_tokens: int = 0) -> None:
+        """
+        Wait until a request with estimated_tokens may be sent
+
+        Args:
+            estimated_tokens: Estimated prompt + completion tokens for the request
+        """
+        # A single request larger than the whole bucket must still go through
+        tokens = min(estimated_tokens, self.tpm) if self.tpm > 0 else 0
+        requests = 1 if self.rpm > 0 else 0
+
+        while True:
+            self._refill()
+
+            if self._requests_available >= requests and self._tokens_available >= tokens:
+                self._requests_available -= requests
+                self._tokens_available -= tokens
+                return
+
+            wait = 0.0
+            if self._requests_available < requests:
+                wait = (requests - self._requests_available) * 60 / self.rpm
+            if self._tokens_available < tokens:
+                wait = max(wait, (tokens - self._tokens_available) * 60 / self.tpm)
+
+            await asyncio.sleep(wait)
+
+
+@functools.lru_cache(maxsize=1)
+def get_limiter() -> AsyncLimiter:
+    """
+    Get the process-wide limiter shared by all provider calls
+
+    Requests default to 40/min (GAVEL_RPM). The token limit is off unless
+    GAVEL_TPM is set: estimates charge the full prompt plus max_tokens,
+    which for a typical report is more than a low tier's whole minute of
+    input tokens, so a default limit would serialize the batch.
+    """
+    rpm = float(os.getenv("GAVEL_RPM", "40"))
+    tpm = float(os.getenv("GAVEL_TPM", "0"))
+    return AsyncLimiter(rpm=rpm, tpm=tpm)
@@ -0,0 +1,101 @@
+"""Retry policy shared by the AI provider calls"""
+
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Optional
+
+import anthropic
+import httpx
+from tenacity import (
+    RetryCallState,
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+
+
+# Status codes worth retrying: rate limits, timeouts and server-side failures
+# (529 is Anthropic's "overloaded")
+RETRY_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# Never sleep longer than this, whatever Retry-After asks for
+MAX_RETRY_AFTER = 60.0
+
+_backoff = wait_exponential_jitter(initial=1, max=30)
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    """HTTP status code carried by an API error, if any"""
+    if isinstance(exc, anthropic.APIStatusError):
+        return exc.status_code
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code
+    return None
+
+
+def is_transient(exc: BaseException) -> bool:
+    """
+    Check whether a failed provider call is worth retrying
+
+    Args:
+        exc: Exception raised by the call
+
+    Returns:
+        True for connection problems and retryable HTTP status codes
+    """
+    if isinstance(exc, (httpx.TransportError, anthropic.APIConnectionError)):
+        return True
+    return _status_code(exc) in RETRY_STATUS_CODES
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """
+    Read the Retry-After header of a failed response
+
+    Args:
+        exc: Exception raised by the call
+
+    Returns:
+        Seconds to wait, or None if the server gave no usable hint
+    """
+    # Duck-typed: the Anthropic SDK ships its own httpx fork
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if headers is None:
+        return None
+
+    value = headers.get("retry-after")
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    # Retry-After may also be an HTTP date
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def wait_retry_after(retry_state: RetryCallState) -> float:
+    """Wait as long as Retry-After asks, else back off exponentially with jitter"""
+    exc = retry_state.outcome.exception() if retry_state.outcome else None
+    seconds = retry_after(exc) if exc else None
+    if seconds is not None:
+        return min(seconds, MAX_RETRY_AFTER)
+    return _backoff(retry_state)
+
+
+# Decorator for sync and async provider calls
+retry_transient = retry(
+    retry=retry_if_exception(is_transient),
+    wait=wait_retry_after,
+    stop=stop_after_attempt(6),
+    reraise=True
+)
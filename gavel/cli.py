@@ -1,24 +1,29 @@
 """Gavel CLI - Command line interface with ASCII art"""
 
+import asyncio
 import click
+import os
 import sys
 from pathlib import Path
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 from rich import print as rprint
-import json
 from typing import Optional
 from dotenv import load_dotenv
 
-from gavel.core import verify_report, batch_verify_reports
+from gavel.core import verify_report, batch_verify_reports, aiter_verify_reports
 from gavel.utils.parser import parse_report_file
+from gavel.utils import jsonio
 
 # Load environment variables
 load_dotenv()
 
 console = Console()
 
+# Extensions picked up from a --batch directory
+REPORT_EXTENSIONS = {".txt", ".md", ".html", ".htm"}
+
 ASCII_ART = """
     ╔═══════════════════════════════════════╗
     ║                                       ║
@@ -44,25 +49,43 @@ ASCII_ART = """
        ████████████
 """
 
+# Built once at import rather than on every print
+_BANNER = Text(ASCII_ART, style="bold cyan")
+
+_VERDICT_STYLES = {"VALID": "bold green"}
+
+
+def _ndjson_line(result: dict) -> str:
+    """Serialize one result as a compact JSON line"""
+    return jsonio.dumps(result) + "\n"
+
 
 def print_banner():
     """Print ASCII art banner"""
-    banner_text = Text(ASCII_ART, style="bold cyan")
-    console.print(banner_text)
+    console.print(_BANNER)
 
 
-def print_result(verdict: str, reasoning: str, output_format: str = "text", report_id: Optional[str] = None):
-    """Print verification result in specified format"""
-    if output_format == "json":
+def print_result(
+    verdict: str,
+    reasoning: str,
+    output_format: str = "text",
+    report_id: Optional[str] = None,
+    report_file: Optional[str] = None
+):
+    """Print verification result in specified format (report_file names the report in the text panel title)"""
+    if output_format in ("json", "ndjson"):
         result = {
             "verdict": verdict,
             "reasoning": reasoning,
             "report_id": report_id,
         }
-        print(json.dumps(result, indent=2))
+        if output_format == "ndjson":
+            sys.stdout.write(_ndjson_line(result))
+        else:
+            print(jsonio.dumps(result, indent=True))
     else:
         # Text format with rich styling
-        verdict_style = "bold green" if verdict == "VALID" else "bold red"
+        verdict_style = _VERDICT_STYLES.get(verdict, "bold red")
 
         panel_content = f"[{verdict_style}]{verdict}[/{verdict_style}]\n\n"
         panel_content += f"[dim]Reasoning:[/dim] {reasoning}"
@@ -70,15 +93,38 @@ def print_result(verdict: str, reasoning: str, output_format: str = "text", repo
         if report_id:
             panel_content += f"\n\n[dim]Report ID:[/dim] {report_id}"
 
+        title = "🔨 Verification Result"
+        if report_file:
+            # Text, not markup, so brackets in file names print as-is
+            title = Text(f"{title}: {os.path.basename(report_file)}")
+
         panel = Panel(
             panel_content,
-            title="🔨 Verification Result",
+            title=title,
             border_style=verdict_style,
             expand=False
         )
         console.print(panel)
 
 
+async def _stream_batch(output_format: str, **kwargs) -> None:
+    """Print batch results as each one completes (ndjson lines or text panels)"""
+    async for result in aiter_verify_reports(**kwargs):
+        if output_format == "ndjson":
+            sys.stdout.write(_ndjson_line(result))
+            sys.stdout.flush()
+        else:
+            print_result(
+                result["verdict"],
+                result["reasoning"],
+                output_format,
+                result.get("report_id"),
+                # Panels arrive in completion order, so each names its report
+                result["file"]
+            )
+            console.print()  # Blank line between results
+
+
 @click.command()
 @click.option(
     "--report", "-r",
@@ -106,18 +152,29 @@ def print_result(verdict: str, reasoning: str, output_format: str = "text", repo
     type=click.Path(exists=True),
     help="Process multiple reports from a directory"
 )
+@click.option(
+    "--max-concurrent",
+    type=click.IntRange(min=1),
+    default=5,
+    help="Maximum number of reports verified concurrently in batch mode (default: 5)"
+)
 @click.option(
     "--format",
     "output_format",
-    type=click.Choice(["text", "json"], case_sensitive=False),
+    type=click.Choice(["text", "json", "ndjson"], case_sensitive=False),
     default="text",
-    help="Output format (default: text)"
+    help="Output format; ndjson streams batch results as they complete (default: text)"
 )
 @click.option(
     "--verbose", "-v",
     is_flag=True,
     help="Enable verbose logging"
 )
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Ignore cached results and always query the AI provider"
+)
 @click.option(
     "--no-banner",
     is_flag=True,
@@ -129,8 +186,10 @@ def main(
     output_poc: bool,
     model: str,
     batch: Optional[str],
+    max_concurrent: int,
     output_format: str,
     verbose: bool,
+    no_cache: bool,
     no_banner: bool
 ):
     """
@@ -168,13 +227,13 @@ def main(
                 console.print("[bold red]Error:[/bold red] Batch path must be a directory", style="red")
                 sys.exit(1)
 
-            # Find all report files (supports .txt, .md, .html)
-            report_files = (
-                list(batch_path.glob("*.txt")) +
-                list(batch_path.glob("*.md")) +
-                list(batch_path.glob("*.html")) +
-                list(batch_path.glob("*.htm"))
-            )
+            # Find all report files (supports .txt, .md, .html) in one directory scan
+            with os.scandir(batch_path) as it:
+                report_files = sorted(
+                    entry.path for entry in it
+                    if entry.is_file(follow_symlinks=False)
+                    and os.path.splitext(entry.name)[1].lower() in REPORT_EXTENSIONS
+                )
 
             if not report_files:
                 console.print("[bold red]Error:[/bold red] No report files found in batch directory", style="red")
@@ -183,27 +242,23 @@ def main(
             if verbose:
                 console.print(f"[dim]Found {len(report_files)} reports to process[/dim]")
 
-            # Process batch
-            results = batch_verify_reports(
-                report_files=[str(f) for f in report_files],
+            batch_args = dict(
+                report_files=report_files,
                 codebase_path=codebase,
                 model=model,
                 generate_poc=output_poc,
-                verbose=verbose
+                verbose=verbose,
+                max_concurrent=max_concurrent,
+                use_cache=not no_cache
             )
 
-            # Output results
             if output_format == "json":
-                print(json.dumps(results, indent=2))
+                # A JSON array needs every result, in input order
+                results = batch_verify_reports(**batch_args)
+                print(jsonio.dumps(results, indent=True))
             else:
-                for result in results:
-                    print_result(
-                        result["verdict"],
-                        result["reasoning"],
-                        output_format,
-                        result.get("report_id")
-                    )
-                    console.print()  # Blank line between results
+                # Output each result as soon as it is ready
+                asyncio.run(_stream_batch(output_format, **batch_args))
 
         # Single report processing
         else:
@@ -223,7 +278,8 @@ def main(
                 codebase_path=codebase,
                 model=model,
                 generate_poc=output_poc,
-                verbose=verbose
+                verbose=verbose,
+                use_cache=not no_cache
             )
 
             # Print result
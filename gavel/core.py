@@ -1,15 +1,21 @@
 """Core verification logic for Gavel"""
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator, Awaitable, Callable, Tuple
 from pathlib import Path
+from datetime import datetime, timezone
+import asyncio
 import os
+import secrets
+
+import httpx
 
 from gavel.models import VerificationResult
-from gavel.tools.grep import search_codebase
+from gavel.tools.grep import search_codebase, CodebaseIndex
 from gavel.tools.optimizer import optimize_code_for_tokens
 from gavel.tools.github import clone_or_pull_repo
 from gavel.utils.security import sanitize_input, detect_prompt_injection, sanitize_ai_output
 from gavel.utils.parser import extract_vulnerability_details
+from gavel.utils.cache import cache_key, get_cached_result, store_result
 
 
 def verify_report(
@@ -17,7 +23,10 @@ def verify_report(
     codebase_path: str,
     model: str = "opus-4.5",
     generate_poc: bool = False,
-    verbose: bool = False
+    verbose: bool = False,
+    use_cache: bool = True,
+    index: Optional[CodebaseIndex] = None,
+    local_path: Optional[str] = None
 ) -> VerificationResult:
     """
     Verify a vulnerability report against a codebase
@@ -28,6 +37,9 @@ def verify_report(
         model: AI model to use ("opus-4.5" or "sonnet-4.5")
         generate_poc: Whether to generate a PoC
         verbose: Enable verbose logging
+        use_cache: Reuse results of identical earlier verifications
+        index: Preloaded index of the codebase (skips resolving and walking it)
+        local_path: Already resolved local directory of the codebase (skips cloning it)
 
     Returns:
         VerificationResult with verdict and reasoning
@@ -35,7 +47,161 @@ def verify_report(
     # Sanitize inputs for security
     report = sanitize_input(report)
 
-    # Detect prompt injection attempts
+    rejected = _check_prompt_injection(report, verbose)
+    if rejected:
+        return rejected
+
+    optimized_code = _build_code_context(report, codebase_path, verbose, index, local_path)
+
+    key = cache_key(report, optimized_code, model, generate_poc) if use_cache else None
+    if key:
+        cached = get_cached_result(key)
+        if cached:
+            if verbose:
+                print("Using cached verification result")
+            return cached
+
+    provider = _select_provider(model)
+
+    # Import here to avoid circular dependency
+    from gavel.ai.anthropic import verify_with_anthropic
+    from gavel.ai.openrouter import verify_with_openrouter
+
+    if provider == "anthropic":
+        if verbose:
+            print("Using Anthropic API")
+        result = verify_with_anthropic(
+            report=report,
+            code_context=optimized_code,
+            model=model,
+            generate_poc=generate_poc,
+            verbose=verbose
+        )
+    else:
+        if verbose:
+            print("Using OpenRouter API")
+        result = verify_with_openrouter(
+            report=report,
+            code_context=optimized_code,
+            model=model,
+            generate_poc=generate_poc,
+            verbose=verbose
+        )
+
+    if key:
+        store_result(key, result)
+
+    return result
+
+
+async def averify_report(
+    report: str,
+    codebase_path: str,
+    model: str = "opus-4.5",
+    generate_poc: bool = False,
+    verbose: bool = False,
+    use_cache: bool = True,
+    index: Optional[CodebaseIndex] = None,
+    local_path: Optional[str] = None,
+    anthropic_client: Optional[Any] = None,
+    http_client: Optional[httpx.AsyncClient] = None
+) -> VerificationResult:
+    """
+    Async variant of verify_report
+
+    Codebase search runs in a worker thread so that API round-trips of
+    other reports keep progressing while this one greps the codebase.
+
+    Args:
+        report: The vulnerability report content
+        codebase_path: Path to codebase (local or GitHub URL)
+        model: AI model to use ("opus-4.5" or "sonnet-4.5")
+        generate_poc: Whether to generate a PoC
+        verbose: Enable verbose logging
+        use_cache: Reuse results of identical earlier verifications
+        index: Preloaded index of the codebase (skips resolving and walking it)
+        local_path: Already resolved local directory of the codebase (skips cloning it)
+        anthropic_client: Shared AsyncAnthropic client
+        http_client: Shared httpx.AsyncClient for OpenRouter
+
+    Returns:
+        VerificationResult with verdict and reasoning
+    """
+    # Sanitize inputs for security
+    report = sanitize_input(report)
+
+    rejected = _check_prompt_injection(report, verbose)
+    if rejected:
+        return rejected
+
+    return await _averify_screened(
+        report, codebase_path, model, generate_poc, verbose, use_cache,
+        index, local_path, anthropic_client, http_client
+    )
+
+
+async def _averify_screened(
+    report: str,
+    codebase_path: str,
+    model: str,
+    generate_poc: bool,
+    verbose: bool,
+    use_cache: bool,
+    index: Optional[CodebaseIndex],
+    local_path: Optional[str],
+    anthropic_client: Optional[Any],
+    http_client: Optional[httpx.AsyncClient]
+) -> VerificationResult:
+    """Verify a report that has already been sanitized and checked for prompt injection"""
+    optimized_code = await asyncio.to_thread(
+        _build_code_context, report, codebase_path, verbose, index, local_path
+    )
+
+    key = cache_key(report, optimized_code, model, generate_poc) if use_cache else None
+    if key:
+        cached = get_cached_result(key)
+        if cached:
+            if verbose:
+                print("Using cached verification result")
+            return cached
+
+    provider = _select_provider(model)
+
+    # Import here to avoid circular dependency
+    from gavel.ai.anthropic import averify_with_anthropic
+    from gavel.ai.openrouter import averify_with_openrouter
+
+    if provider == "anthropic":
+        if verbose:
+            print("Using Anthropic API")
+        result = await averify_with_anthropic(
+            report=report,
+            code_context=optimized_code,
+            model=model,
+            generate_poc=generate_poc,
+            verbose=verbose,
+            client=anthropic_client
+        )
+    else:
+        if verbose:
+            print("Using OpenRouter API")
+        result = await averify_with_openrouter(
+            report=report,
+            code_context=optimized_code,
+            model=model,
+            generate_poc=generate_poc,
+            verbose=verbose,
+            client=http_client
+        )
+
+    if key:
+        store_result(key, result)
+
+    return result
+
+
+def _check_prompt_injection(report: str, verbose: bool) -> Optional[VerificationResult]:
+    """Return an INVALID result if the report looks like a prompt injection"""
     is_suspicious, reason = detect_prompt_injection(report, aggressive=True)
     if is_suspicious:
         if verbose:
@@ -46,16 +212,35 @@ def verify_report(
             reasoning=f"Report rejected due to potential security issue. This report contains patterns associated with prompt injection attacks and cannot be processed safely.",
             confidence="high"
         )
+    return None
+
 
+def _resolve_codebase(codebase_path: str, verbose: bool) -> Path:
+    """Clone/pull a GitHub URL or validate a local path, returning the local directory"""
     # Determine if it's a GitHub URL or local path
     if codebase_path.startswith("http://") or codebase_path.startswith("https://"):
         if verbose:
             print(f"Cloning/pulling repository: {codebase_path}")
-        local_path = clone_or_pull_repo(codebase_path, verbose=verbose)
-    else:
-        local_path = Path(codebase_path).resolve()
-        if not local_path.exists():
-            raise ValueError(f"Codebase path does not exist: {codebase_path}")
+        return clone_or_pull_repo(codebase_path, verbose=verbose)
+
+    local_path = Path(codebase_path).resolve()
+    if not local_path.exists():
+        raise ValueError(f"Codebase path does not exist: {codebase_path}")
+    return local_path
+
+
+def _build_code_context(
+    report: str,
+    codebase_path: str,
+    verbose: bool,
+    index: Optional[CodebaseIndex] = None,
+    local_path: Optional[str] = None
+) -> str:
+    """Resolve the codebase, search it for relevant code and optimize it for tokens"""
+    if index is not None:
+        local_path = index.root
+    elif local_path is None:
+        local_path = _resolve_codebase(codebase_path, verbose)
 
     # Extract key details from vulnerability report
     vuln_details = extract_vulnerability_details(report)
@@ -67,7 +252,8 @@ def verify_report(
     relevant_code = search_codebase(
         codebase_path=str(local_path),
         vulnerability_details=vuln_details,
-        verbose=verbose
+        verbose=verbose,
+        index=index
     )
 
     if verbose:
@@ -79,41 +265,41 @@ def verify_report(
     if verbose:
         print(f"Optimized code for token efficiency")
 
-    # Choose AI provider based on model and available API keys
+    return optimized_code
+
+
+def _load_codebase(codebase_path: str, verbose: bool) -> Dict[str, Any]:
+    """Resolve and index the codebase for a batch (a resolution failure is returned as "error")"""
+    try:
+        local_path = str(_resolve_codebase(codebase_path, verbose))
+    except Exception as e:
+        return {"error": e}
+
+    try:
+        index = CodebaseIndex.load(local_path)
+    except Exception as e:
+        # Reports can still be searched without the index
+        if verbose:
+            print(f"Failed to index codebase: {e}")
+        index = None
+
+    return {"local_path": local_path, "index": index}
+
+
+def _select_provider(model: str) -> str:
+    """Choose AI provider ("anthropic" or "openrouter") based on model and available API keys"""
     use_anthropic = os.getenv("ANTHROPIC_API_KEY") and model in ["opus-4.5", "sonnet-4.5"]
     use_openrouter = os.getenv("OPENROUTER_API_KEY")
 
-    # Import here to avoid circular dependency
-    from gavel.ai.anthropic import verify_with_anthropic
-    from gavel.ai.openrouter import verify_with_openrouter
-
     # Prefer Anthropic for direct API, fallback to OpenRouter
     if use_anthropic and not use_openrouter:
-        if verbose:
-            print("Using Anthropic API")
-        result = verify_with_anthropic(
-            report=report,
-            code_context=optimized_code,
-            model=model,
-            generate_poc=generate_poc,
-            verbose=verbose
-        )
-    elif use_openrouter:
-        if verbose:
-            print("Using OpenRouter API")
-        result = verify_with_openrouter(
-            report=report,
-            code_context=optimized_code,
-            model=model,
-            generate_poc=generate_poc,
-            verbose=verbose
-        )
-    else:
-        raise ValueError(
-            "No API key found. Please set ANTHROPIC_API_KEY or OPENROUTER_API_KEY in .env"
-        )
+        return "anthropic"
+    if use_openrouter:
+        return "openrouter"
 
-    return result
+    raise ValueError(
+        "No API key found. Please set ANTHROPIC_API_KEY or OPENROUTER_API_KEY in .env"
+    )
 
 
 def batch_verify_reports(
@@ -121,67 +307,245 @@ def batch_verify_reports(
     codebase_path: str,
     model: str = "opus-4.5",
     generate_poc: bool = False,
-    verbose: bool = False
+    verbose: bool = False,
+    max_concurrent: int = 5,
+    use_cache: bool = True
 ) -> List[Dict[str, Any]]:
     """
     Verify multiple vulnerability reports in batch
 
+    Synchronous wrapper around abatch_verify_reports.
+
     Args:
         report_files: List of paths to report files
         codebase_path: Path to codebase (local or GitHub URL)
         model: AI model to use
         generate_poc: Whether to generate PoCs
         verbose: Enable verbose logging
+        max_concurrent: Maximum number of reports verified at once
+        use_cache: Reuse results of identical earlier verifications
 
     Returns:
         List of verification results as dictionaries
     """
-    results = []
+    return asyncio.run(abatch_verify_reports(
+        report_files=report_files,
+        codebase_path=codebase_path,
+        model=model,
+        generate_poc=generate_poc,
+        verbose=verbose,
+        max_concurrent=max_concurrent,
+        use_cache=use_cache
+    ))
 
-    for report_file in report_files:
-        if verbose:
-            print(f"\nProcessing: {report_file}")
 
-        try:
-            # Read report
-            with open(report_file, "r", encoding="utf-8") as f:
-                report_content = f.read()
+async def abatch_verify_reports(
+    report_files: List[str],
+    codebase_path: str,
+    model: str = "opus-4.5",
+    generate_poc: bool = False,
+    verbose: bool = False,
+    max_concurrent: int = 5,
+    use_cache: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Verify multiple vulnerability reports concurrently
 
-            # Verify
-            result = verify_report(
-                report=report_content,
+    All reports share one HTTP connection pool; at most max_concurrent
+    reports are in flight at any time.
+
+    Args:
+        report_files: List of paths to report files
+        codebase_path: Path to codebase (local or GitHub URL)
+        model: AI model to use
+        generate_poc: Whether to generate PoCs
+        verbose: Enable verbose logging
+        max_concurrent: Maximum number of reports verified at once
+        use_cache: Reuse results of identical earlier verifications
+
+    Returns:
+        List of verification results as dictionaries, in input order
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(report_files)
+    async for i, result in _averify_files(
+        report_files, codebase_path, model, generate_poc, verbose, max_concurrent, use_cache
+    ):
+        results[i] = result
+    return results
+
+
+async def aiter_verify_reports(
+    report_files: List[str],
+    codebase_path: str,
+    model: str = "opus-4.5",
+    generate_poc: bool = False,
+    verbose: bool = False,
+    max_concurrent: int = 5,
+    use_cache: bool = True
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Verify multiple vulnerability reports concurrently, yielding each
+    result as soon as it is ready
+
+    Results arrive in completion order, not input order; use the "file"
+    key to match them to reports.
+
+    Args:
+        report_files: List of paths to report files
+        codebase_path: Path to codebase (local or GitHub URL)
+        model: AI model to use
+        generate_poc: Whether to generate PoCs
+        verbose: Enable verbose logging
+        max_concurrent: Maximum number of reports verified at once
+        use_cache: Reuse results of identical earlier verifications
+
+    Yields:
+        Verification results as dictionaries
+    """
+    async for _, result in _averify_files(
+        report_files, codebase_path, model, generate_poc, verbose, max_concurrent, use_cache
+    ):
+        yield result
+
+
+async def _averify_files(
+    report_files: List[str],
+    codebase_path: str,
+    model: str,
+    generate_poc: bool,
+    verbose: bool,
+    max_concurrent: int,
+    use_cache: bool
+) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+    """Verify report files concurrently, yielding (input index, result dict) as each completes"""
+    sem = asyncio.Semaphore(max(1, max_concurrent))
+
+    # The Anthropic SDK manages its own connection pool; one client is
+    # shared by every task so keep-alive connections are reused
+    anthropic_client = None
+    api_key = os.getenv("ANTHROPIC_API_KEY")
+    if api_key:
+        from anthropic import AsyncAnthropic
+        from gavel.ai.anthropic import _TIMEOUT
+        # Retries come from retry_transient, not the SDK
+        anthropic_client = AsyncAnthropic(api_key=api_key, max_retries=0, timeout=_TIMEOUT)
+
+    # Resolve and index the codebase once instead of once per report, and only
+    # when the first report passes screening (a batch of rejected reports never
+    # clones anything)
+    codebase_lock = asyncio.Lock()
+    codebase: Dict[str, Any] = {}
+
+    async def load_codebase() -> Tuple[str, Optional[CodebaseIndex]]:
+        async with codebase_lock:
+            if not codebase:
+                codebase.update(await asyncio.to_thread(_load_codebase, codebase_path, verbose))
+        if "error" in codebase:
+            # Every report fails with this error rather than retrying the clone
+            raise codebase["error"]
+        return codebase["local_path"], codebase["index"]
+
+    async with httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=100),
+        timeout=120
+    ) as http_client:
+        tasks = [
+            asyncio.ensure_future(_bounded(sem, _indexed(i, _averify_file(
+                report_file,
                 codebase_path=codebase_path,
                 model=model,
                 generate_poc=generate_poc,
-                verbose=verbose
-            )
+                verbose=verbose,
+                use_cache=use_cache,
+                load_codebase=load_codebase,
+                anthropic_client=anthropic_client,
+                http_client=http_client
+            ))))
+            for i, report_file in enumerate(report_files)
+        ]
 
-            # Convert to dict
-            result_dict = {
-                "file": report_file,
-                "verdict": result.verdict,
-                "reasoning": result.reasoning,
-                "confidence": result.confidence,
-                "report_id": result.report_id,
-                "timestamp": result.timestamp,
-            }
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Stop outstanding work if the consumer stops iterating early
+            for task in tasks:
+                task.cancel()
+            if anthropic_client is not None:
+                await anthropic_client.close()
 
-            if result.poc:
-                result_dict["poc"] = result.poc
 
-            results.append(result_dict)
+async def _indexed(i: int, coro) -> Tuple[int, Any]:
+    """Await coro and pair its result with i"""
+    return i, await coro
 
-        except Exception as e:
-            if verbose:
-                print(f"Error processing {report_file}: {e}")
 
-            results.append({
-                "file": report_file,
-                "verdict": "ERROR",
-                "reasoning": f"Failed to process: {str(e)}",
-                "confidence": "low",
-                "report_id": str(uuid.uuid4())[:8],
-                "timestamp": datetime.utcnow().isoformat() + "Z",
-            })
+async def _bounded(sem: asyncio.Semaphore, coro):
+    """Await coro while holding a slot of sem"""
+    async with sem:
+        return await coro
 
-    return results
+
+async def _averify_file(
+    report_file: str,
+    codebase_path: str,
+    model: str,
+    generate_poc: bool,
+    verbose: bool,
+    use_cache: bool,
+    load_codebase: Callable[[], Awaitable[Tuple[str, Optional[CodebaseIndex]]]],
+    anthropic_client: Optional[Any],
+    http_client: Optional[httpx.AsyncClient]
+) -> Dict[str, Any]:
+    """Verify a single report file and convert the outcome to a result dictionary"""
+    if verbose:
+        print(f"\nProcessing: {report_file}")
+
+    try:
+        # Read report
+        with open(report_file, "r", encoding="utf-8") as f:
+            report_content = f.read()
+
+        # Screen the report before touching the codebase so rejected
+        # reports cost no clone, search or API call
+        report = sanitize_input(report_content)
+        result = _check_prompt_injection(report, verbose)
+
+        if result is None:
+            local_path, index = await load_codebase()
+
+            # Verify
+            result = await _averify_screened(
+                report, codebase_path, model, generate_poc, verbose, use_cache,
+                index, local_path, anthropic_client, http_client
+            )
+
+        # Convert to dict
+        result_dict = {
+            "file": report_file,
+            "verdict": result.verdict,
+            "reasoning": result.reasoning,
+            "confidence": result.confidence,
+            "report_id": result.report_id,
+            "timestamp": result.timestamp,
+        }
+
+        if result.poc:
+            result_dict["poc"] = result.poc
+
+        return result_dict
+
+    except Exception as e:
+        if verbose:
+            print(f"Error processing {report_file}: {e}")
+
+        return {
+            "file": report_file,
+            "verdict": "ERROR",
+            "reasoning": f"Failed to process: {str(e)}",
+            "confidence": "low",
+            "report_id": secrets.token_hex(4),
+            # Same format as VerificationResult timestamps
+            "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        }
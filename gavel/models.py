@@ -2,11 +2,16 @@
 
 from dataclasses import dataclass
 from typing import Optional
-import uuid
-from datetime import datetime
+import secrets
+import sys
+from datetime import datetime, timezone
 
 
-@dataclass
+# Slotted dataclasses (no per-instance __dict__) need Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class VerificationResult:
     """Result of vulnerability verification"""
     verdict: str  # "VALID" or "INVALID"
@@ -18,6 +23,6 @@ class VerificationResult:
 
     def __post_init__(self):
         if not self.report_id:
-            self.report_id = str(uuid.uuid4())[:8]
+            self.report_id = secrets.token_hex(4)
         if not self.timestamp:
-            self.timestamp = datetime.utcnow().isoformat() + "Z"
+            self.timestamp = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
@@ -1,7 +1,7 @@
 """Tools for code analysis and optimization"""
 
-from gavel.tools.grep import search_codebase
+from gavel.tools.grep import search_codebase, CodebaseIndex
 from gavel.tools.optimizer import optimize_code_for_tokens
-from gavel.tools.github import clone_or_pull_repo
+from gavel.tools.github import clone_or_pull_repo, clone_or_pull_repos
 
-__all__ = ["search_codebase", "optimize_code_for_tokens", "clone_or_pull_repo"]
+__all__ = ["search_codebase", "CodebaseIndex", "optimize_code_for_tokens", "clone_or_pull_repo", "clone_or_pull_repos"]
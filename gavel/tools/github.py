@@ -3,11 +3,38 @@
 import os
 import re
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import List, Match, Optional
 import subprocess
 import hashlib
 
+from gavel.tools.grep import clear_file_caches
+
+
+# Repository URLs accepted for cloning: HTTPS (optionally ending in / or .git)
+# and SSH, with the owner and repository name captured
+_GITHUB_URL_RE = re.compile(
+    r"^(?:https?://github\.com/|git@github\.com:)"
+    r"(?P<owner>[\w\-]+)/(?P<repo>[\w\-]+)(?:\.git)?/?$"
+)
+
+# Share one SSH connection per host between git processes, so cloning several
+# git@github.com URLs only pays the SSH handshake once
+_SSH_COMMAND = (
+    "ssh -o ControlMaster=auto -o ControlPersist=60s "
+    f"-o ControlPath={tempfile.gettempdir()}/gavel_ssh_%r@%h:%p"
+)
+
+
+def _git_env() -> dict:
+    """Environment for git subprocesses"""
+    env = os.environ.copy()
+    # Respect a user-supplied ssh command; ControlMaster needs a POSIX ssh
+    if os.name == "posix" and "GIT_SSH_COMMAND" not in env:
+        env["GIT_SSH_COMMAND"] = _SSH_COMMAND
+    return env
+
 
 def clone_or_pull_repo(repo_url: str, verbose: bool = False) -> Path:
     """
@@ -25,7 +52,8 @@ def clone_or_pull_repo(repo_url: str, verbose: bool = False) -> Path:
         RuntimeError: If git operations fail
     """
     # Validate URL
-    if not _is_valid_github_url(repo_url):
+    match = _GITHUB_URL_RE.match(repo_url)
+    if match is None:
         raise ValueError(f"Invalid GitHub URL: {repo_url}")
 
     # Create a cache directory for repos
@@ -33,9 +61,10 @@ def clone_or_pull_repo(repo_url: str, verbose: bool = False) -> Path:
     cache_dir.mkdir(exist_ok=True)
 
     # Generate a safe directory name from URL
-    repo_name = _get_repo_name_from_url(repo_url)
-    repo_hash = hashlib.md5(repo_url.encode()).hexdigest()[:8]
+    repo_name = _get_repo_name_from_url(repo_url, match)
+    repo_hash = hashlib.blake2b(repo_url.encode(), digest_size=4).hexdigest()
     local_path = cache_dir / f"{repo_name}_{repo_hash}"
+    env = _git_env()
 
     # Check if repo already exists
     if local_path.exists() and (local_path / ".git").exists():
@@ -43,15 +72,34 @@ def clone_or_pull_repo(repo_url: str, verbose: bool = False) -> Path:
             print(f"Repository already exists, pulling latest changes...")
 
         try:
-            # Pull latest changes
+            # Fetch only the tip of the cloned branch (no tags, no forced-update
+            # scan, no alternate refs) and move the checkout to it; unlike a
+            # pull this never has to merge into the shallow history
             subprocess.run(
-                ["git", "-C", str(local_path), "pull"],
+                [
+                    "git", "-C", str(local_path),
+                    "-c", "core.alternateRefsCommand=exit 0",
+                    "-c", "fetch.showForcedUpdates=false",
+                    "fetch", "--depth", "1", "--no-tags", "origin"
+                ],
                 check=True,
                 capture_output=True,
                 text=True,
-                timeout=60
+                timeout=60,
+                env=env
+            )
+            subprocess.run(
+                ["git", "-C", str(local_path), "reset", "--hard", "FETCH_HEAD"],
+                check=True,
+                capture_output=True,
+                text=True,
+                timeout=60,
+                env=env
             )
 
+            # The checkout changed in place; drop file lists and contents read before
+            clear_file_caches()
+
             if verbose:
                 print(f"Updated repository at {local_path}")
 
@@ -66,13 +114,20 @@ def clone_or_pull_repo(repo_url: str, verbose: bool = False) -> Path:
             print(f"Cloning repository: {repo_url}")
 
         try:
-            # Use depth=1 for faster cloning
+            # Only the latest commit of the default branch is needed, without tags.
+            # Objects are not shared with sibling clones of forks (--reference):
+            # git refuses shallow repositories as references, and all clones
+            # here are shallow
             subprocess.run(
-                ["git", "clone", "--depth", "1", repo_url, str(local_path)],
+                [
+                    "git", "clone", "--depth", "1", "--no-tags", "--single-branch",
+                    repo_url, str(local_path)
+                ],
                 check=True,
                 capture_output=True,
                 text=True,
-                timeout=300  # 5 minutes timeout
+                timeout=300,  # 5 minutes timeout
+                env=env
             )
 
             if verbose:
@@ -84,23 +139,46 @@ def clone_or_pull_repo(repo_url: str, verbose: bool = False) -> Path:
     return local_path
 
 
+def clone_or_pull_repos(repo_urls: List[str], verbose: bool = False, jobs: int = 8) -> List[Path]:
+    """
+    Clone or pull several GitHub repositories in parallel
+
+    Args:
+        repo_urls: GitHub repository URLs
+        verbose: Enable verbose logging
+        jobs: Maximum number of concurrent git operations
+
+    Returns:
+        Paths to the local repositories, in the order of repo_urls
+
+    Raises:
+        ValueError: If a URL is invalid
+        RuntimeError: If git operations fail
+    """
+    # Each URL is handled once; two workers on the same checkout would collide
+    unique_urls = list(dict.fromkeys(repo_urls))
+
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(unique_urls)))) as pool:
+        paths = dict(zip(
+            unique_urls,
+            pool.map(lambda url: clone_or_pull_repo(url, verbose=verbose), unique_urls)
+        ))
+
+    return [paths[url] for url in repo_urls]
+
+
 def _is_valid_github_url(url: str) -> bool:
     """Check if URL is a valid GitHub repository URL"""
-    patterns = [
-        r"^https?://github\.com/[\w\-]+/[\w\-]+/?$",
-        r"^https?://github\.com/[\w\-]+/[\w\-]+\.git$",
-        r"^git@github\.com:[\w\-]+/[\w\-]+\.git$",
-    ]
-
-    for pattern in patterns:
-        if re.match(pattern, url):
-            return True
+    return _GITHUB_URL_RE.match(url) is not None
 
-    return False
 
+def _get_repo_name_from_url(url: str, match: Optional[Match[str]] = None) -> str:
+    """Extract repository name from GitHub URL (match: its _GITHUB_URL_RE match, if known)"""
+    if match is None:
+        match = _GITHUB_URL_RE.match(url)
+    if match is not None:
+        return f"{match['owner']}_{match['repo']}"
 
-def _get_repo_name_from_url(url: str) -> str:
-    """Extract repository name from GitHub URL"""
     # Remove .git suffix
     url = url.rstrip("/").replace(".git", "")
 
@@ -110,7 +188,7 @@ def _get_repo_name_from_url(url: str) -> str:
         return f"{match.group(1)}_{match.group(2)}"
 
     # Fallback to hash
-    return hashlib.md5(url.encode()).hexdigest()[:16]
+    return hashlib.blake2b(url.encode(), digest_size=8).hexdigest()
 
 
 def get_repo_info(repo_path: Path) -> Optional[dict]:
@@ -129,23 +207,16 @@ def get_repo_info(repo_path: Path) -> Optional[dict]:
     info = {}
 
     try:
-        # Get current branch
-        result = subprocess.run(
-            ["git", "-C", str(repo_path), "branch", "--show-current"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        info["branch"] = result.stdout.strip()
-
-        # Get latest commit hash
+        # Get current branch and latest commit hash in one git call
         result = subprocess.run(
-            ["git", "-C", str(repo_path), "rev-parse", "HEAD"],
+            ["git", "-C", str(repo_path), "rev-parse", "HEAD", "--abbrev-ref", "HEAD"],
             capture_output=True,
             text=True,
             check=True
         )
-        info["commit"] = result.stdout.strip()[:8]
+        commit, branch = result.stdout.split()
+        info["branch"] = "" if branch == "HEAD" else branch  # Detached HEAD has no branch
+        info["commit"] = commit[:8]
 
         # Get remote URL
         result = subprocess.run(
@@ -156,7 +227,7 @@ def get_repo_info(repo_path: Path) -> Optional[dict]:
         )
         info["remote"] = result.stdout.strip()
 
-    except subprocess.CalledProcessError:
+    except (subprocess.CalledProcessError, ValueError):
         pass
 
     return info if info else None
@@ -1,37 +1,172 @@
 """Efficient code grepping and search utilities"""
 
+import bisect
+import functools
+import io
+import json
 import os
 import re
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Set, Tuple
 import subprocess
 
 
 # File extensions to search (code files only)
-CODE_EXTENSIONS = {
+CODE_EXTENSIONS = frozenset({
     ".py", ".js", ".ts", ".jsx", ".tsx", ".java", ".cpp", ".c", ".h", ".hpp",
     ".go", ".rs", ".php", ".rb", ".swift", ".kt", ".scala", ".sol", ".vy",
     ".sh", ".bash"
-}
+})
 
 # Files to always ignore (lock files, configs, etc.)
-IGNORE_FILES = {
+IGNORE_FILES = frozenset({
     "pnpm-lock.yaml", "package-lock.json", "yarn.lock", "Cargo.lock",
     "Gemfile.lock", "poetry.lock", "composer.lock"
-}
+})
 
 # Directories to ignore
-IGNORE_DIRS = {
+IGNORE_DIRS = frozenset({
     "node_modules", ".git", ".venv", "venv", "env", "__pycache__",
     "dist", "build", ".next", "out", "target", "vendor", ".idea",
     ".vscode", "coverage", ".pytest_cache", ".mypy_cache"
-}
+})
+
+# Generated bundles that pass the extension filter but are useless as context
+_MINIFIED_RE = re.compile(r"\.(?:min|bundle|chunk)\.")
+
+# Files larger than this are never read
+MAX_FILE_SIZE_MB = 1
+
+# Bytes sniffed from the start of a file to spot binary or minified content
+SNIFF_BYTES = 4096
+
+# Average line length above which a file is treated as minified
+MAX_AVERAGE_LINE_LENGTH = 400
+
+# Threads used to read files in parallel (reads are I/O bound)
+READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Marks a file rejected by a prefilter (distinct from None, an unreadable file)
+_SKIPPED = object()
+
+# File contents read by _read_file_safe are kept across searches, revalidated
+# by size and modification time, up to this many characters in total (least
+# recently used files are evicted first)
+CONTENT_CACHE_MAX_CHARS = 256 * 1024 * 1024
+
+_content_cache: "OrderedDict[str, Tuple[int, int, int, str]]" = OrderedDict()
+_content_cache_chars = 0
+_content_cache_lock = threading.Lock()
+
+
+class CodebaseIndex:
+    """
+    In-memory index of a codebase shared by repeated searches
+
+    The file list is collected once when the index is loaded; code file
+    contents are read in parallel on first use and kept in memory, so a
+    batch of reports against one codebase walks and reads the tree once.
+    """
+
+    def __init__(self, root: str, paths: List[str]):
+        self.root = root
+        self.paths = paths
+        self._contents: Optional[Dict[str, str]] = None
+        self._lowered: Optional[Tuple[bytes, List[int], List[str]]] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, codebase_path: str) -> "CodebaseIndex":
+        """
+        Walk a codebase and build an index of its files
+
+        Args:
+            codebase_path: Path to codebase root
+
+        Returns:
+            CodebaseIndex for the codebase
+        """
+        return cls(str(codebase_path), list(_walk_files.__wrapped__(codebase_path)))
+
+    @property
+    def contents(self) -> Dict[str, str]:
+        """Contents of readable code files keyed by path, in walk order"""
+        with self._lock:
+            if self._contents is None:
+                code_paths = [p for p in self.paths if Path(p).suffix in CODE_EXTENSIONS]
+                with ThreadPoolExecutor(max_workers=READ_WORKERS) as pool:
+                    texts = list(pool.map(_read_file_safe, code_paths))
+                self._contents = {p: t for p, t in zip(code_paths, texts) if t}
+            return self._contents
+
+    def files_containing(self, keywords_lower: List[str], max_files: int) -> List[str]:
+        """
+        Find the first code files, in walk order, containing any of the keywords
+
+        The lowercased contents of all files are joined once into one UTF-8
+        buffer (bytes stay compact when a single file is non-ASCII, and a
+        UTF-8 match always starts on a character boundary), so each keyword
+        is a single bytes.find scan over the whole codebase rather than one
+        substring test per file, and the Python-level work is proportional to
+        the matches.
+
+        Args:
+            keywords_lower: Lowercase keywords
+            max_files: Maximum number of paths to return
+
+        Returns:
+            Matching paths in walk order
+        """
+        contents = self.contents
+        with self._lock:
+            if self._lowered is None:
+                paths = list(contents)
+                lowered = [contents[p].lower().encode("utf-8", "surrogatepass") for p in paths]
+                starts = []
+                offset = 0
+                for data in lowered:
+                    starts.append(offset)
+                    offset += len(data) + 1
+                self._lowered = (b"\x00".join(lowered), starts, paths)
+            corpus, starts, paths = self._lowered
+
+        # The first max_files matches overall are among the first max_files
+        # files matching some single keyword, so each scan can stop there
+        hits: Set[int] = set()
+        for keyword in (k.encode("utf-8", "surrogatepass") for k in keywords_lower):
+            # Once max_files files matched, later keywords only matter before the last of them
+            end = len(corpus)
+            if len(hits) >= max_files:
+                last = sorted(hits)[max_files - 1]
+                end = starts[last + 1] if last + 1 < len(starts) else len(corpus)
+
+            found = 0
+            start = 0
+            while found < max_files:
+                position = corpus.find(keyword, start, end)
+                if position < 0:
+                    break
+                file_index = bisect.bisect_right(starts, position) - 1
+                file_end = starts[file_index + 1] - 1 if file_index + 1 < len(starts) else len(corpus)
+                if position + len(keyword) > file_end:
+                    # Match runs into the next file
+                    start = position + 1
+                    continue
+                hits.add(file_index)
+                found += 1
+                start = file_end + 1
+
+        return [paths[i] for i in sorted(hits)[:max_files]]
 
 
 def search_codebase(
     codebase_path: str,
     vulnerability_details: Dict,
-    verbose: bool = False
+    verbose: bool = False,
+    index: Optional[CodebaseIndex] = None
 ) -> Dict[str, str]:
     """
     Search codebase for code relevant to vulnerability report
@@ -40,12 +175,16 @@ def search_codebase(
         codebase_path: Path to codebase root
         vulnerability_details: Extracted vulnerability details
         verbose: Enable verbose logging
+        index: Preloaded index of the codebase (searched in memory if given)
 
     Returns:
         Dictionary mapping file paths to relevant code sections
     """
     relevant_code = {}
 
+    # Without an index, files read by one search step are reused by the next
+    content_cache: Dict[str, Optional[str]] = {}
+
     # Build search terms from vulnerability details
     search_terms = _build_search_terms(vulnerability_details)
 
@@ -55,9 +194,9 @@ def search_codebase(
     # First, try to find explicitly mentioned files
     mentioned_files = vulnerability_details.get("affected_files", [])
     for file_name in mentioned_files:
-        file_path = _find_file_in_codebase(codebase_path, file_name)
+        file_path = _find_file_in_codebase(codebase_path, file_name, index)
         if file_path:
-            content = _read_file_safe(file_path)
+            content = _read_file_cached(file_path, content_cache)
             if content:
                 relevant_code[file_path] = content
                 if verbose:
@@ -66,7 +205,7 @@ def search_codebase(
     # Search for functions mentioned in report
     mentioned_functions = vulnerability_details.get("affected_functions", [])
     for function_name in mentioned_functions:
-        matches = _search_for_function(codebase_path, function_name)
+        matches = _search_for_function(codebase_path, function_name, index, content_cache)
         for file_path, code in matches.items():
             if file_path not in relevant_code:
                 relevant_code[file_path] = code
@@ -78,7 +217,9 @@ def search_codebase(
         keyword_matches = _search_by_keywords(
             codebase_path,
             search_terms,
-            max_files=10
+            max_files=10,
+            index=index,
+            content_cache=content_cache
         )
         for file_path, code in keyword_matches.items():
             if file_path not in relevant_code:
@@ -116,13 +257,17 @@ def _build_search_terms(vulnerability_details: Dict) -> List[str]:
                 terms.extend(keywords)
                 break
 
-    # Remove duplicates and filter short terms
-    terms = list(set([t for t in terms if len(t) > 2]))
+    # Remove duplicates (keeping order so results are deterministic) and filter short terms
+    terms = list(dict.fromkeys(t for t in terms if len(t) > 2))
 
     return terms
 
 
-def _find_file_in_codebase(codebase_path: str, file_name: str) -> Optional[str]:
+def _find_file_in_codebase(
+    codebase_path: str,
+    file_name: str,
+    index: Optional[CodebaseIndex] = None
+) -> Optional[str]:
     """Find a file by name in the codebase"""
     codebase = Path(codebase_path)
 
@@ -131,102 +276,272 @@ def _find_file_in_codebase(codebase_path: str, file_name: str) -> Optional[str]:
     if exact_path.exists() and exact_path.is_file():
         return str(exact_path)
 
-    # Search recursively
-    for root, dirs, files in os.walk(codebase):
-        # Remove ignored directories
-        dirs[:] = [d for d in dirs if d not in IGNORE_DIRS]
+    paths = index.paths if index is not None else _list_files(codebase_path)
 
-        for file in files:
-            if file == Path(file_name).name:
-                return os.path.join(root, file)
+    # Search recursively
+    base_name = Path(file_name).name
+    for file_path in paths:
+        if os.path.basename(file_path) == base_name:
+            return file_path
 
     return None
 
 
-def _search_for_function(codebase_path: str, function_name: str) -> Dict[str, str]:
+def _list_files(codebase_path: str) -> Tuple[str, ...]:
+    """
+    List all files under codebase_path outside IGNORE_DIRS, in walk order
+
+    The walk is cached per directory and reused until the directory's
+    modification time changes.
+    """
+    try:
+        mtime = os.stat(codebase_path).st_mtime_ns
+    except OSError:
+        return ()
+    return _walk_files(str(codebase_path), os.path.realpath(codebase_path), mtime)
+
+
+@functools.lru_cache(maxsize=8)
+def _walk_files(codebase_path: str, *cache_key) -> Tuple[str, ...]:
+    """Walk codebase_path (cache_key only distinguishes cached walks)"""
+    # Same order and entries as os.walk (files of a directory, then each
+    # subdirectory in turn; symlinked directories listed but not entered),
+    # using the DirEntry type information scandir already has
+    paths = []
+    stack = [codebase_path]
+    while stack:
+        directory = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        paths.append(entry.path)
+                    elif entry.name not in IGNORE_DIRS and not entry.is_symlink():
+                        subdirs.append(entry.path)
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+    return tuple(paths)
+
+
+def _iter_code_files(
+    codebase_path: str,
+    index: Optional[CodebaseIndex] = None,
+    content_cache: Optional[Dict[str, Optional[str]]] = None,
+    prefilter: Optional[Callable[[str], bool]] = None
+) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (path, content) for every readable code file in the codebase
+
+    Files not yet read for which prefilter(path) is False are skipped
+    without being read as text.
+    """
+    if index is not None:
+        yield from index.contents.items()
+        return
+
+    # Skip non-code files and ignored files
+    code_paths = []
+    for file_path in _list_files(codebase_path):
+        file = os.path.basename(file_path)
+        if os.path.splitext(file)[1] in CODE_EXTENSIONS and file not in IGNORE_FILES:
+            code_paths.append(file_path)
+
+    if content_cache is None:
+        content_cache = {}
+
+    # Read ahead in parallel, a bounded window at a time so that callers
+    # stopping early don't wait on reads they never use; yield in walk order
+    pool = ThreadPoolExecutor(max_workers=READ_WORKERS)
+    window: Deque[Tuple[str, Optional[Future]]] = deque()
+    remaining = iter(code_paths)
+    try:
+        while True:
+            while len(window) < READ_WORKERS * 2:
+                file_path = next(remaining, None)
+                if file_path is None:
+                    break
+                if file_path in content_cache:
+                    window.append((file_path, None))
+                else:
+                    window.append((file_path, pool.submit(_read_file_if, file_path, prefilter)))
+
+            if not window:
+                break
+
+            file_path, future = window.popleft()
+            if future is not None:
+                result = future.result()
+                if result is _SKIPPED:
+                    continue
+                content_cache[file_path] = result
+            content = content_cache[file_path]
+
+            if content:
+                yield file_path, content
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _read_file_if(file_path: str, prefilter: Optional[Callable[[str], bool]]):
+    """_read_file_safe, or _SKIPPED if prefilter rejects the file"""
+    if prefilter is not None:
+        # A cached read is cheaper than the prefilter
+        try:
+            content = _get_cached_content(file_path, os.stat(file_path))
+        except OSError:
+            content = None
+        if content is not None:
+            return content
+        if not prefilter(file_path):
+            return _SKIPPED
+    return _read_file_safe(file_path)
+
+
+def _read_file_cached(
+    file_path: str,
+    content_cache: Optional[Dict[str, Optional[str]]] = None
+) -> Optional[str]:
+    """_read_file_safe, remembering results in content_cache when given"""
+    if content_cache is None:
+        return _read_file_safe(file_path)
+    if file_path not in content_cache:
+        content_cache[file_path] = _read_file_safe(file_path)
+    return content_cache[file_path]
+
+
+def _search_for_function(
+    codebase_path: str,
+    function_name: str,
+    index: Optional[CodebaseIndex] = None,
+    content_cache: Optional[Dict[str, Optional[str]]] = None
+) -> Dict[str, str]:
     """Search for function definition in codebase"""
+    # Try using ripgrep if available (much faster), unless the files are already in memory
+    if index is None and _has_ripgrep():
+        rg_matches = _ripgrep_function_search(codebase_path, function_name, 5, content_cache)
+        if rg_matches is not None:
+            return rg_matches
+
     matches = {}
-    codebase = Path(codebase_path)
+    definition = _function_definition_regex(function_name)
 
-    # Function definition patterns for different languages
-    patterns = [
-        rf"def\s+{re.escape(function_name)}\s*\(",  # Python
-        rf"function\s+{re.escape(function_name)}\s*\(",  # JavaScript
-        rf"{re.escape(function_name)}\s*:\s*function",  # JS object method
-        rf"(public|private|protected)?\s*\w*\s+{re.escape(function_name)}\s*\(",  # Java/C++/C#
-        rf"fn\s+{re.escape(function_name)}\s*\(",  # Rust
-        rf"func\s+{re.escape(function_name)}\s*\(",  # Go
-    ]
+    for file_path, content in _iter_code_files(codebase_path, index, content_cache):
+        if definition.search(content):
+            matches[file_path] = content
 
-    for root, dirs, files in os.walk(codebase):
-        dirs[:] = [d for d in dirs if d not in IGNORE_DIRS]
+        if len(matches) >= 5:  # Limit to prevent too many matches
+            break
 
-        for file in files:
-            if Path(file).suffix not in CODE_EXTENSIONS:
-                continue
+    return matches
 
-            file_path = os.path.join(root, file)
-            content = _read_file_safe(file_path)
 
-            if not content:
-                continue
+def _function_definition_patterns(function_name: str) -> List[str]:
+    """Regex patterns (valid for both Python re and ripgrep) matching a definition of function_name"""
+    name = re.escape(function_name)
 
-            for pattern in patterns:
-                if re.search(pattern, content, re.MULTILINE):
-                    matches[file_path] = content
-                    break
+    # Function definition patterns for different languages
+    return [
+        rf"def\s+{name}\s*\(",  # Python
+        rf"function\s+{name}\s*\(",  # JavaScript
+        rf"{name}\s*:\s*function",  # JS object method
+        # Java/C++/C#: modifiers and return type precede the name; they are
+        # all optional, so "whitespace before the name" is the same test
+        # without the quadratic backtracking of (?:public|...)?\s*\w*\s+
+        rf"\s{name}\s*\(",
+        rf"fn\s+{name}\s*\(",  # Rust
+        rf"func\s+{name}\s*\(",  # Go
+    ]
 
-            if len(matches) >= 5:  # Limit to prevent too many matches
-                break
 
-    return matches
+@functools.lru_cache(maxsize=256)
+def _function_definition_regex(function_name: str) -> "re.Pattern[str]":
+    """Compile one regex matching a definition of function_name in any supported language"""
+    # A single alternation scans each file once instead of once per pattern
+    return re.compile("|".join(_function_definition_patterns(function_name)), re.MULTILINE)
 
 
 def _search_by_keywords(
     codebase_path: str,
     keywords: List[str],
-    max_files: int = 5  # Reduced from 10
+    max_files: int = 5,  # Reduced from 10
+    index: Optional[CodebaseIndex] = None,
+    content_cache: Optional[Dict[str, Optional[str]]] = None
 ) -> Dict[str, str]:
     """Search codebase by keywords using grep-like functionality"""
     matches = {}
-    codebase = Path(codebase_path)
 
-    # Try using ripgrep if available (much faster)
-    if _has_ripgrep():
-        return _ripgrep_search(codebase_path, keywords, max_files)
+    # Try using ripgrep if available (much faster), unless the files are already in memory
+    if index is None and _has_ripgrep():
+        return _ripgrep_search(codebase_path, keywords, max_files, content_cache)
+
+    # Lowercase (and dedupe) the keywords once, not once per file
+    keywords_lower = list(dict.fromkeys(keyword.lower() for keyword in keywords))
+
+    # An index answers from its joined lowercase contents
+    if index is not None:
+        contents = index.contents
+        return {
+            file_path: contents[file_path]
+            for file_path in index.files_containing(keywords_lower, max(max_files, 1))
+        }
+
+    # Files on disk are first checked as raw bytes, so only files that may
+    # match get decoded (ASCII keywords only, as bytes.lower() folds only ASCII)
+    prefilter = None
+    if all(keyword.isascii() for keyword in keywords_lower):
+        keywords_bytes = [keyword.encode() for keyword in keywords_lower]
+        prefilter = functools.partial(_file_may_contain, keywords_bytes=keywords_bytes)
 
     # Fallback to Python-based search
-    for root, dirs, files in os.walk(codebase):
-        dirs[:] = [d for d in dirs if d not in IGNORE_DIRS]
-
-        for file in files:
-            # Skip non-code files and ignored files
-            if Path(file).suffix not in CODE_EXTENSIONS:
-                continue
-            if file in IGNORE_FILES:
-                continue
-
-            file_path = os.path.join(root, file)
-            content = _read_file_safe(file_path)
-
-            if not content:
-                continue
-
-            # Check if any keyword appears in the file
-            content_lower = content.lower()
-            for keyword in keywords:
-                if keyword.lower() in content_lower:
-                    matches[file_path] = content
-                    break
+    for file_path, content in _iter_code_files(codebase_path, None, content_cache, prefilter):
+        # Check if any keyword appears in the file; substring tests on one
+        # lowered copy beat a case-insensitive regex alternation in CPython
+        content_lower = content.lower()
+        if any(keyword in content_lower for keyword in keywords_lower):
+            matches[file_path] = content
 
-            if len(matches) >= max_files:
-                return matches
+        if len(matches) >= max_files:
+            return matches
 
     return matches
 
 
+def _file_may_contain(file_path: str, keywords_bytes: List[bytes]) -> bool:
+    """
+    Cheap check whether a file may contain any of the lowercase ASCII keywords
+
+    Searches the raw bytes without decoding. False means the file cannot
+    match; True (also returned when in doubt) means it has to be read.
+    """
+    max_bytes = MAX_FILE_SIZE_MB * 1024 * 1024
+    try:
+        # Files over the cap are skipped by _read_file_safe anyway
+        if os.stat(file_path).st_size > max_bytes:
+            return False
+        with open(file_path, "rb") as f:
+            data = f.read(max_bytes)
+    except OSError:
+        return True
+
+    # bytes.lower() only folds ASCII, and decoding can turn non-ASCII bytes
+    # into ASCII letters (e.g. the Kelvin sign lowers to "k"), so only
+    # pure-ASCII files can be ruled out here
+    if not data.isascii():
+        return True
+
+    data = data.lower()
+    return any(keyword in data for keyword in keywords_bytes)
+
+
+@functools.lru_cache(maxsize=1)
 def _has_ripgrep() -> bool:
-    """Check if ripgrep is available"""
+    """Check if ripgrep is available (checked once per process)"""
     try:
         subprocess.run(
             ["rg", "--version"],
@@ -241,10 +556,13 @@ def _has_ripgrep() -> bool:
 def _ripgrep_search(
     codebase_path: str,
     keywords: List[str],
-    max_files: int = 5  # Reduced from 10
+    max_files: int = 5,  # Reduced from 10
+    content_cache: Optional[Dict[str, Optional[str]]] = None
 ) -> Dict[str, str]:
     """Use ripgrep for fast searching"""
     matches = {}
+    if not keywords:
+        return matches
 
     # Build file type filters to exclude lock files and configs
     exclude_patterns = [
@@ -252,46 +570,118 @@ def _ripgrep_search(
         "*.json", "*.yaml", "*.yml", "*.md"
     ]
 
-    for keyword in keywords[:3]:  # Limit keywords to prevent too many results
+    rg_args = [
+        "rg",
+        "-l",  # Files with matches only
+        "--max-count", "1",
+        "-i",  # Case insensitive
+        "-F",  # Keywords are literal strings, not regexes
+    ]
+
+    # Add exclude patterns
+    for pattern in exclude_patterns:
+        rg_args.extend(["-g", f"!{pattern}"])
+
+    # All keywords in one run, so the tree is scanned once
+    for keyword in keywords[:8]:  # Limit keywords to prevent too many results
+        rg_args.extend(["-e", keyword])
+
+    rg_args.extend(["--", codebase_path])
+
+    try:
+        result = subprocess.run(
+            rg_args,
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+    except (subprocess.TimeoutExpired, OSError):
+        return matches
+
+    if result.returncode == 0:
+        # ripgrep searches in parallel, so sort for deterministic results
+        for file_path in sorted(result.stdout.splitlines()):
+            if file_path and file_path not in matches:
+                content = _read_file_cached(file_path, content_cache)
+                if content:
+                    matches[file_path] = content
+
+            if len(matches) >= max_files:
+                break
+
+    return matches
+
+
+def _ripgrep_function_search(
+    codebase_path: str,
+    function_name: str,
+    max_files: int = 5,
+    content_cache: Optional[Dict[str, Optional[str]]] = None
+) -> Optional[Dict[str, str]]:
+    """
+    Find files defining function_name with a single ripgrep run
+
+    Searches the same files as the Python fallback: code extensions only,
+    ignored directories and files skipped, .gitignore not honoured.
+
+    Returns:
+        Dictionary mapping file paths to contents, or None if ripgrep failed
+        (the caller then falls back to the Python search)
+    """
+    code_glob = "code:*.{" + ",".join(sorted(ext[1:] for ext in CODE_EXTENSIONS)) + "}"
+    rg_args = [
+        "rg",
+        "--json",
+        "-m", "1",  # One match per file is enough
+        "--no-ignore",
+        "--hidden",
+        "--max-filesize", "1M",  # Larger files are skipped by _read_file_safe anyway
+        "--type-add", code_glob,
+        "-t", "code",
+    ]
+
+    for name in sorted(IGNORE_DIRS):
+        rg_args.extend(["-g", f"!{name}/"])
+    for name in sorted(IGNORE_FILES):
+        rg_args.extend(["-g", f"!{name}"])
+    for pattern in _function_definition_patterns(function_name):
+        rg_args.extend(["-e", pattern])
+
+    rg_args.extend(["--", codebase_path])
+
+    try:
+        result = subprocess.run(rg_args, capture_output=True, text=True, timeout=10)
+    except (subprocess.TimeoutExpired, OSError):
+        return None
+
+    # 0 = matches, 1 = no matches, anything else is an error
+    if result.returncode not in (0, 1):
+        return None
+
+    file_paths = set()
+    for line in result.stdout.splitlines():
         try:
-            rg_args = [
-                "rg",
-                "-l",  # Files with matches only
-                "--max-count", "1",
-                "-i",  # Case insensitive
-            ]
-
-            # Add exclude patterns
-            for pattern in exclude_patterns:
-                rg_args.extend(["-g", f"!{pattern}"])
-
-            rg_args.extend([keyword, codebase_path])
-
-            result = subprocess.run(
-                rg_args,
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-
-            if result.returncode == 0:
-                file_paths = result.stdout.strip().split("\n")
-                for file_path in file_paths[:max_files]:
-                    if file_path and file_path not in matches:
-                        content = _read_file_safe(file_path)
-                        if content:
-                            matches[file_path] = content
-
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError):
+            event = json.loads(line)
+        except ValueError:
             continue
+        if event.get("type") == "match":
+            path = event["data"]["path"].get("text")
+            if path:
+                file_paths.add(path)
 
-        if len(matches) >= max_files:
-            break
+    # ripgrep searches in parallel, so sort for deterministic results
+    matches = {}
+    for file_path in sorted(file_paths):
+        content = _read_file_cached(file_path, content_cache)
+        if content:
+            matches[file_path] = content
+            if len(matches) >= max_files:
+                break
 
     return matches
 
 
-def _read_file_safe(file_path: str, max_size_mb: int = 1, max_lines: int = 500) -> Optional[str]:
+def _read_file_safe(file_path: str, max_size_mb: int = MAX_FILE_SIZE_MB, max_lines: int = 500) -> Optional[str]:
     """
     Safely read file with size and line limits
 
@@ -304,25 +694,85 @@ def _read_file_safe(file_path: str, max_size_mb: int = 1, max_lines: int = 500)
         File content or None if too large/unreadable
     """
     try:
-        # Skip ignored files
+        # Skip ignored files and generated bundles
         file_name = os.path.basename(file_path)
-        if file_name in IGNORE_FILES:
+        if file_name in IGNORE_FILES or _MINIFIED_RE.search(file_name):
             return None
 
         # Check file size
-        file_size = os.path.getsize(file_path)
-        if file_size > max_size_mb * 1024 * 1024:
+        stat = os.stat(file_path)
+        if stat.st_size > max_size_mb * 1024 * 1024:
             return None
 
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+        # Reuse an earlier read if the file hasn't changed since
+        content = _get_cached_content(file_path, stat, max_lines)
+        if content is not None:
+            return content
+
+        with open(file_path, "rb") as raw:
+            # Skip binary files (NUL bytes, as git and ripgrep detect them)
+            # and minified ones (very long lines) before decoding anything
+            head = raw.read(SNIFF_BYTES)
+            if b"\x00" in head:
+                return None
+            if len(head) > MAX_AVERAGE_LINE_LENGTH * (head.count(b"\n") + 1):
+                return None
+            raw.seek(0)
+
             # Read only up to max_lines
             lines = []
-            for i, line in enumerate(f):
+            for i, line in enumerate(io.TextIOWrapper(raw, encoding="utf-8", errors="ignore")):
                 if i >= max_lines:
                     lines.append(f"\n... (file truncated after {max_lines} lines)")
                     break
                 lines.append(line.rstrip())
-            return "\n".join(lines)
+            content = "\n".join(lines)
+
+        _store_cached_content(file_path, stat, max_lines, content)
+        return content
 
     except Exception:
         return None
+
+
+def _get_cached_content(file_path: str, stat: os.stat_result, max_lines: int = 500) -> Optional[str]:
+    """Content cached for file_path if the file still matches stat, else None"""
+    with _content_cache_lock:
+        entry = _content_cache.get(file_path)
+        if entry is None or entry[:3] != (stat.st_size, stat.st_mtime_ns, max_lines):
+            return None
+        _content_cache.move_to_end(file_path)
+        return entry[3]
+
+
+def _store_cached_content(file_path: str, stat: os.stat_result, max_lines: int, content: str) -> None:
+    """Remember content read from a file, evicting old entries over budget"""
+    global _content_cache_chars
+    if len(content) > CONTENT_CACHE_MAX_CHARS:
+        return
+
+    with _content_cache_lock:
+        old = _content_cache.pop(file_path, None)
+        if old is not None:
+            _content_cache_chars -= len(old[3])
+        _content_cache[file_path] = (stat.st_size, stat.st_mtime_ns, max_lines, content)
+        _content_cache_chars += len(content)
+
+        while _content_cache_chars > CONTENT_CACHE_MAX_CHARS:
+            _, evicted = _content_cache.popitem(last=False)
+            _content_cache_chars -= len(evicted[3])
+
+
+def clear_file_caches() -> None:
+    """
+    Forget cached file lists and contents
+
+    Files are revalidated by modification time, but a directory's own mtime
+    does not change when files deeper in the tree do; call this after
+    updating a codebase in place (e.g. pulling a repository).
+    """
+    global _content_cache_chars
+    _walk_files.cache_clear()
+    with _content_cache_lock:
+        _content_cache.clear()
+        _content_cache_chars = 0
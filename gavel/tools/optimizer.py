@@ -1,7 +1,40 @@
 """Token optimization utilities to reduce API costs"""
 
+import ast
+import os
 import re
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+try:
+    import tiktoken
+except ImportError:  # optional: pip install gavel-verify[tokenizer]
+    tiktoken = None
+
+
+# Function definitions: Python, JavaScript, Rust, Go, and Java/C++ style
+_FUNCTION_DEF_PATTERN = (
+    r"(?:def|function|fn|func)\s+\w+"
+    r"|(?:public|private|protected)?\s*\w+\s+\w+\s*\("
+)
+
+# Import statements across languages
+_IMPORT_PATTERN = (
+    r"import\s+"
+    r"|from\s+.*\s+import\s+"
+    r"|require\s*\("
+    r"|#include\s+"
+    r"|using\s+"
+    r"|use\s+"
+)
+
+# Classifies a stripped line in one match; a function definition takes precedence
+_LINE_KIND_RE = re.compile(rf"(?P<definition>{_FUNCTION_DEF_PATTERN})|(?P<import>{_IMPORT_PATTERN})")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Comment markers: Python/Shell, C++/Java/JS, and multi-line C-style
+_COMMENT_PREFIXES = ("#", "//", "/*", "*")
 
 
 def optimize_code_for_tokens(code_dict: Dict[str, str], verbose: bool = False) -> str:
@@ -15,6 +48,10 @@ def optimize_code_for_tokens(code_dict: Dict[str, str], verbose: bool = False) -
     - Focus on function implementations
     - Remove trailing whitespace
 
+    The output depends only on code_dict (including its order), so the same
+    search results always produce the same text. This keeps the prompt
+    prefix and the result cache key stable across runs.
+
     Args:
         code_dict: Dictionary mapping file paths to code content
         verbose: Enable verbose logging
@@ -27,14 +64,12 @@ def optimize_code_for_tokens(code_dict: Dict[str, str], verbose: bool = False) -
     total_optimized_lines = 0
 
     for file_path, content in code_dict.items():
-        original_lines = len(content.split("\n"))
-        total_original_lines += original_lines
+        total_original_lines += content.count("\n") + 1
 
         # Optimize the code
         optimized = _optimize_single_file(content)
 
-        optimized_lines = len(optimized.split("\n"))
-        total_optimized_lines += optimized_lines
+        total_optimized_lines += optimized.count("\n") + 1
 
         # Add file marker
         file_marker = f"\n{'='*60}\n"
@@ -52,14 +87,12 @@ def optimize_code_for_tokens(code_dict: Dict[str, str], verbose: bool = False) -
 
 def _optimize_single_file(content: str) -> str:
     """Optimize a single file's content"""
-    lines = content.split("\n")
     optimized_lines = []
 
-    in_function = False
     import_section_done = False
     consecutive_blank_lines = 0
 
-    for i, line in enumerate(lines):
+    for line in content.split("\n"):
         stripped = line.strip()
 
         # Skip empty lines after first blank
@@ -71,25 +104,28 @@ def _optimize_single_file(content: str) -> str:
         else:
             consecutive_blank_lines = 0
 
-        # Detect if we're in a function
-        if _is_function_definition(stripped):
-            in_function = True
-            import_section_done = True
-
-        # Skip imports unless we're specifically looking at them
-        if not import_section_done and _is_import_line(stripped):
-            # Skip most imports, keep critical ones
-            if _is_critical_import(stripped):
-                optimized_lines.append(line.rstrip())
-            continue
+        # Within the import section, one match tells function definitions
+        # (which end the section) from imports; past it neither matters
+        if not import_section_done:
+            kind = _LINE_KIND_RE.match(stripped)
+            if kind is not None:
+                if kind.lastgroup == "definition":
+                    import_section_done = True
+                else:
+                    # Skip most imports, keep critical ones
+                    if _is_critical_import(stripped):
+                        optimized_lines.append(line.rstrip())
+                    continue
+
+        is_comment = stripped.startswith(_COMMENT_PREFIXES)
 
         # Mark end of import section
-        if not _is_import_line(stripped) and not _is_comment_line(stripped):
+        if not is_comment:
             import_section_done = True
 
         # Optimize comments
-        if _is_comment_line(stripped):
-            optimized_comment = _optimize_comment(line)
+        if is_comment:
+            optimized_comment = _optimize_comment(stripped)
             if optimized_comment:  # Only keep non-empty comments
                 optimized_lines.append(optimized_comment)
             continue
@@ -100,41 +136,6 @@ def _optimize_single_file(content: str) -> str:
     return "\n".join(optimized_lines)
 
 
-def _is_function_definition(line: str) -> bool:
-    """Check if line is a function definition"""
-    patterns = [
-        r"^\s*def\s+\w+",  # Python
-        r"^\s*function\s+\w+",  # JavaScript
-        r"^\s*(public|private|protected)?\s*\w+\s+\w+\s*\(",  # Java/C++
-        r"^\s*fn\s+\w+",  # Rust
-        r"^\s*func\s+\w+",  # Go
-    ]
-
-    for pattern in patterns:
-        if re.match(pattern, line):
-            return True
-
-    return False
-
-
-def _is_import_line(line: str) -> bool:
-    """Check if line is an import statement"""
-    patterns = [
-        r"^\s*import\s+",
-        r"^\s*from\s+.*\s+import\s+",
-        r"^\s*require\s*\(",
-        r"^\s*#include\s+",
-        r"^\s*using\s+",
-        r"^\s*use\s+",
-    ]
-
-    for pattern in patterns:
-        if re.match(pattern, line):
-            return True
-
-    return False
-
-
 def _is_critical_import(line: str) -> bool:
     """
     Determine if an import is critical (relates to security, crypto, etc.)
@@ -148,21 +149,6 @@ def _is_critical_import(line: str) -> bool:
     return any(keyword in line_lower for keyword in critical_keywords)
 
 
-def _is_comment_line(line: str) -> bool:
-    """Check if line is a comment"""
-    stripped = line.strip()
-
-    # Single-line comments
-    if stripped.startswith("#"):  # Python, Shell
-        return True
-    if stripped.startswith("//"):  # C++, Java, JS
-        return True
-    if stripped.startswith("/*") or stripped.startswith("*"):  # Multi-line C-style
-        return True
-
-    return False
-
-
 def _optimize_comment(line: str) -> str:
     """
     Optimize comment by removing extra spaces while preserving meaning
@@ -188,7 +174,7 @@ def _optimize_comment(line: str) -> str:
         return line
 
     # Compress multiple spaces to single space
-    content = re.sub(r"\s+", " ", content.strip())
+    content = _WHITESPACE_RE.sub(" ", content.strip())
 
     # Skip very short or generic comments
     generic_comments = [
@@ -203,13 +189,18 @@ def _optimize_comment(line: str) -> str:
     return marker + content
 
 
-def extract_functions_only(content: str, function_names: List[str]) -> str:
+def extract_functions_only(content: str, function_names: List[str], suffix: str = "") -> str:
     """
     Extract only specific functions from code
 
+    Python files are parsed with ast, which gives exact function boundaries
+    (decorators included). Other languages, and Python that fails to parse,
+    fall back to indentation tracking.
+
     Args:
         content: Full file content
         function_names: List of function names to extract
+        suffix: File suffix (e.g. ".py") used to pick the extraction strategy
 
     Returns:
         Code containing only specified functions
@@ -217,6 +208,16 @@ def extract_functions_only(content: str, function_names: List[str]) -> str:
     if not function_names:
         return content
 
+    if suffix == ".py":
+        extracted = _extract_python_functions(content, function_names)
+        if extracted is not None:
+            return extracted
+
+    # One search per line for all names instead of one per name
+    name_re = re.compile(
+        r"\b(?:" + "|".join(re.escape(name) for name in function_names) + r")\s*\("
+    )
+
     lines = content.split("\n")
     extracted = []
     current_function = None
@@ -227,12 +228,11 @@ def extract_functions_only(content: str, function_names: List[str]) -> str:
         stripped = line.strip()
 
         # Check if this is a function definition we want
-        for func_name in function_names:
-            if re.search(rf"\b{re.escape(func_name)}\s*\(", line):
-                current_function = func_name
-                function_lines = [line]
-                indent_level = len(line) - len(line.lstrip())
-                break
+        match = name_re.search(line)
+        if match:
+            current_function = match.group(0)
+            function_lines = [line]
+            indent_level = len(line) - len(line.lstrip())
 
         # If we're collecting a function
         if current_function:
@@ -256,10 +256,64 @@ def extract_functions_only(content: str, function_names: List[str]) -> str:
     return "\n".join(extracted) if extracted else content
 
 
+def _extract_python_functions(content: str, function_names: List[str]) -> Optional[str]:
+    """
+    Extract Python functions by name using the AST
+
+    Returns:
+        The functions in source order, content if none match, or None if the
+        code does not parse
+    """
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return None
+
+    wanted = set(function_names)
+    nodes = sorted(
+        (
+            node for node in ast.walk(tree)
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name in wanted
+        ),
+        key=lambda node: node.lineno
+    )
+
+    parts = []
+    last_end = 0
+    for node in nodes:
+        # A wanted function nested in one already extracted is part of it
+        if node.lineno <= last_end:
+            continue
+        last_end = node.end_lineno
+
+        indent = " " * node.col_offset
+        decorators = [
+            indent + "@" + ast.get_source_segment(content, decorator)
+            for decorator in node.decorator_list
+        ]
+        parts.append("\n".join(decorators + [ast.get_source_segment(content, node, padded=True)]))
+
+    return "\n\n".join(parts) if parts else content
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    """BPE encoding used for token counts, or None to fall back to the heuristic"""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # The encoding is downloaded on first use, which fails offline
+        return None
+
+
 def estimate_tokens(text: str) -> int:
     """
-    Rough estimate of token count
-    Approximation: ~4 characters per token for code
+    Estimate the token count of text
+
+    Uses tiktoken's cl100k_base encoding when available, otherwise the
+    approximation of ~4 characters per token for code.
 
     Args:
         text: Text to estimate
@@ -267,4 +321,73 @@ def estimate_tokens(text: str) -> int:
     Returns:
         Estimated token count
     """
-    return len(text) // 4
+    encoding = _encoding()
+    if encoding is None:
+        return len(text) // 4
+    return len(encoding.encode_ordinary(text))
+
+
+def estimate_tokens_batch(texts: List[str]) -> List[int]:
+    """
+    Estimate the token counts of several texts at once
+
+    Args:
+        texts: Texts to estimate
+
+    Returns:
+        Estimated token count for each text, in order
+    """
+    encoding = _encoding()
+    if encoding is None:
+        return [len(text) // 4 for text in texts]
+    return [
+        len(tokens)
+        for tokens in encoding.encode_ordinary_batch(texts, num_threads=os.cpu_count() or 1)
+    ]
+
+
+def truncate_to_tokens(text: str, max_tokens: int, strategy: str = "back") -> str:
+    """
+    Truncate text so that its estimated token count fits a budget
+
+    Args:
+        text: Text to truncate
+        max_tokens: Token budget
+        strategy: "back" drops the end and keeps the front (where imports and
+            definitions live), "front" drops the beginning and keeps the end
+
+    Returns:
+        Longest prefix (or suffix) of text within max_tokens
+    """
+    if strategy not in ("back", "front"):
+        raise ValueError(f"Unknown truncation strategy: {strategy}")
+
+    encoding = _encoding()
+    if encoding is not None:
+        tokens = encoding.encode_ordinary(text)
+        if len(tokens) <= max_tokens:
+            return text
+        if max_tokens <= 0:
+            return ""
+        # Cut on token boundaries; drop a character split by the cut
+        kept = tokens[:max_tokens] if strategy == "back" else tokens[-max_tokens:]
+        return encoding.decode_bytes(kept).decode("utf-8", errors="ignore")
+
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+
+    def _part(length: int) -> str:
+        return text[:length] if strategy == "back" else text[len(text) - length:]
+
+    # Binary search for the longest part whose token estimate fits
+    low, high = 0, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if estimate_tokens(_part(mid)) <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+
+    return _part(low)
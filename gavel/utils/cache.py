@@ -0,0 +1,121 @@
+"""Content-addressed cache for verification results"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Optional
+
+from gavel.models import VerificationResult
+
+# Entries older than this are ignored and pruned
+CACHE_MAX_AGE_DAYS = 30
+
+# Most entries kept; the oldest are pruned on write beyond this
+CACHE_MAX_ENTRIES = 1000
+
+
+def get_cache_dir() -> Path:
+    """Directory holding cached results (override with GAVEL_CACHE_DIR)"""
+    return Path(os.getenv("GAVEL_CACHE_DIR") or os.path.expanduser("~/.cache/gavel"))
+
+
+def cache_key(report: str, code_context: str, model: str, generate_poc: bool) -> str:
+    """
+    Build a cache key for a verification request
+
+    Args:
+        report: Sanitized vulnerability report
+        code_context: Optimized code context sent to the model
+        model: Model name
+        generate_poc: Whether a PoC was requested
+
+    Returns:
+        Hex digest identifying the request
+    """
+    digest = hashlib.blake2b(f"{model}|{generate_poc}|".encode(), digest_size=16)
+    digest.update(report.encode("utf-8", errors="surrogatepass"))
+    digest.update(b"\x00")
+    digest.update(code_context.encode("utf-8", errors="surrogatepass"))
+    return digest.hexdigest()
+
+
+def get_cached_result(key: str) -> Optional[VerificationResult]:
+    """
+    Look up a cached verification result
+
+    Args:
+        key: Key from cache_key
+
+    Returns:
+        Cached VerificationResult with a fresh report_id and timestamp,
+        or None on a miss
+    """
+    path = get_cache_dir() / f"{key}.json"
+    try:
+        if time.time() - os.stat(path).st_mtime > CACHE_MAX_AGE_DAYS * 86400:
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        # Each verification gets its own id and time, even when the verdict is reused
+        data.pop("report_id", None)
+        data.pop("timestamp", None)
+        return VerificationResult(**data)
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def store_result(key: str, result: VerificationResult) -> None:
+    """
+    Store a verification result (failures to write are ignored)
+
+    Args:
+        key: Key from cache_key
+        result: Result to cache
+    """
+    cache_dir = get_cache_dir()
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temp file and rename so readers never see partial entries
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=cache_dir, suffix=".tmp", delete=False
+        ) as f:
+            json.dump(asdict(result), f)
+        os.replace(f.name, cache_dir / f"{key}.json")
+
+        _prune(cache_dir)
+
+    except OSError:
+        pass
+
+
+def _prune(cache_dir: Path) -> None:
+    """Delete expired entries, then the oldest ones beyond CACHE_MAX_ENTRIES"""
+    cutoff = time.time() - CACHE_MAX_AGE_DAYS * 86400
+    entries = []
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            # Temp files left behind by interrupted writes expire too
+            if not entry.name.endswith((".json", ".tmp")):
+                continue
+            try:
+                mtime = entry.stat().st_mtime
+                if mtime < cutoff:
+                    os.remove(entry.path)
+                elif entry.name.endswith(".json"):
+                    entries.append((mtime, entry.path))
+            except OSError:
+                pass
+
+    if len(entries) > CACHE_MAX_ENTRIES:
+        entries.sort()
+        for _, path in entries[:len(entries) - CACHE_MAX_ENTRIES]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
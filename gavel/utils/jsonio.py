@@ -0,0 +1,60 @@
+"""JSON encoding and decoding, using orjson when it is installed"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # optional: pip install gavel-verify[fast]
+    orjson = None
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Decode a JSON document
+
+    Args:
+        data: JSON text or UTF-8 bytes
+
+    Returns:
+        Decoded object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """
+    Encode an object as JSON text
+
+    Both backends produce the same output: compact separators, or two-space
+    indentation with indent=True, and non-ASCII characters left unescaped.
+
+    Args:
+        obj: Object to encode
+        indent: Pretty-print with two-space indentation
+
+    Returns:
+        JSON text
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode("utf-8")
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """
+    Encode an object as compact UTF-8 JSON (e.g. for a request body)
+
+    Args:
+        obj: Object to encode
+
+    Returns:
+        JSON bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
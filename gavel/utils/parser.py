@@ -1,54 +1,160 @@
 """Report parsing utilities"""
 
+import functools
 import re
 from typing import Dict, List, Optional
 from pathlib import Path
 from html.parser import HTMLParser
 from io import StringIO
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional: pip install gavel-verify[fast]
+    LexborHTMLParser = None
+
+
+# Vulnerability types, in priority order: the first one mentioned anywhere in
+# the report wins. Each is a substring scan of the lowercased report (checked
+# as a whole word only when found), which stays cheaper than an alternation
+# regex or an Aho-Corasick automaton for a list this short and keeps the
+# priority order independent of text position
+VULN_TYPES = (
+    "SQL Injection", "SQLi",
+    "Cross-Site Scripting", "XSS",
+    "Command Injection",
+    "Path Traversal", "Directory Traversal",
+    "Remote Code Execution", "RCE",
+    "Server-Side Request Forgery", "SSRF",
+    "XML External Entity", "XXE",
+    "Deserialization",
+    "Authentication Bypass",
+    "Authorization Bypass",
+    "Information Disclosure",
+    "Denial of Service", "DoS",
+    "Buffer Overflow",
+    "Integer Overflow",
+    "Use After Free",
+    "Race Condition",
+    "CSRF", "Cross-Site Request Forgery",
+    "Open Redirect",
+    "Insecure Direct Object Reference", "IDOR",
+    "Security Misconfiguration",
+    "Sensitive Data Exposure",
+    "Missing Access Control",
+    "Broken Authentication",
+    "Broken Access Control",
+)
+
+# (lowercase type, whole-word pattern, type): a type only counts as a word or
+# phrase of its own (optionally plural), so "RCE" does not match inside
+# "source" nor "SQLi" inside "SQLite"; the substring check runs first as a
+# cheap prefilter
+_VULN_TYPES_LOWER = tuple(
+    (vuln_type.lower(), re.compile(rf"\b{re.escape(vuln_type.lower())}s?\b"), vuln_type)
+    for vuln_type in VULN_TYPES
+)
+
+# Severity statements, most explicit first
+_SEVERITY_RES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r"severity[:\s]+(\w+)",
+    r"impact[:\s]+(\w+)",
+    r"(critical|high|medium|low)\s+severity",
+))
+
+# File paths: names with a code extension, then anything introduced by in/at/file.
+# Unbounded runs like [\w/.-]+ only start at the beginning of a run of their
+# characters: any match inside a run is also found from its start, and trying
+# every position of a long token (a base64 blob, minified code) is quadratic
+_FILE_RES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r"(?<![\w\/\-\.])[\w\/\-\.]+\.(?:js|py|java|cpp|c|h|go|rs|php|rb|ts|tsx|jsx|sol|vy)",
+    r"(?:in|at|file)\s+[\"\']?([\w\/\-\.]+\.[\w]+)[\"\']?",
+))
+
+# Function names
+_FUNCTION_RES = tuple(re.compile(pattern) for pattern in (
+    r"function\s+(\w+)",
+    r"def\s+(\w+)",
+    r"(?<!\w)(\w+)\s*\(",
+    r"method\s+(\w+)",
+    r"in\s+(?:the\s+)?(\w+)\s+function",
+))
+
+_CWE_RE = re.compile(r"CWE-(\d+)", re.IGNORECASE)
+
+# Important technical terms (matched against the lowercased report)
+_KEYWORD_RES = tuple(re.compile(pattern) for pattern in (
+    r"\b(vulnerable|exploit|attack|payload|injection|bypass|overflow)\b",
+    r"\b(input|output|parameter|argument|variable)\b",
+    r"\b(validate|sanitize|encode|decode|parse|execute)\b",
+))
+
+_CODE_BLOCK_RE = re.compile(r"```[\w]*\n(.*?)```", re.DOTALL)
+_INLINE_CODE_RE = re.compile(r"`([^`]+)`")
+_FILE_LINE_RE = re.compile(r"([\w\/\-\.]+\.[\w]+):(\d+)")
+
+# Runs of three or more newlines in extracted HTML text
+_EXCESS_NEWLINES_RE = re.compile(r"\n{3,}")
+
+# Characters read per parser feed when streaming an HTML report from disk
+HTML_CHUNK_SIZE = 65536
+
 
 class HTMLTextExtractor(HTMLParser):
     """Extract text content from HTML while preserving structure"""
     def __init__(self):
         super().__init__()
-        self.text_parts = []
+        self.text = StringIO()  # One growing buffer instead of a list of fragments
+        self.pending_data = []
         self.in_code = False
         self.in_pre = False
 
     def handle_starttag(self, tag, attrs):
+        self._flush_data()
         if tag in ('code', 'pre'):
             self.in_code = True
             if tag == 'pre':
                 self.in_pre = True
-            self.text_parts.append('\n```\n')
+            self.text.write('\n```\n')
         elif tag == 'br':
-            self.text_parts.append('\n')
+            self.text.write('\n')
         elif tag in ('p', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'):
-            self.text_parts.append('\n\n')
+            self.text.write('\n\n')
 
     def handle_endtag(self, tag):
+        self._flush_data()
         if tag in ('code', 'pre'):
-            self.text_parts.append('\n```\n')
+            self.text.write('\n```\n')
             self.in_code = False
             if tag == 'pre':
                 self.in_pre = False
         elif tag in ('p', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'):
-            self.text_parts.append('\n')
+            self.text.write('\n')
 
     def handle_data(self, data):
+        # A run of text can arrive in several pieces (feed() chunk boundaries,
+        # a stray '<'), so collect it until the next tag and normalize it whole
+        self.pending_data.append(data)
+
+    def _flush_data(self):
+        if not self.pending_data:
+            return
+        data = ''.join(self.pending_data)
+        self.pending_data = []
+
         # Preserve code formatting, normalize other text
         if self.in_pre or self.in_code:
-            self.text_parts.append(data)
+            self.text.write(data)
         else:
             # Normalize whitespace but preserve paragraphs
             normalized = ' '.join(data.split())
             if normalized:
-                self.text_parts.append(normalized)
+                self.text.write(normalized)
 
     def get_text(self):
-        text = ''.join(self.text_parts)
+        self._flush_data()
+        text = self.text.getvalue()
         # Clean up excessive newlines
-        text = re.sub(r'\n{3,}', '\n\n', text)
+        text = _EXCESS_NEWLINES_RE.sub('\n\n', text)
         return text.strip()
 
 
@@ -62,8 +168,49 @@ def parse_html_report(content: str) -> str:
     Returns:
         Extracted text content
     """
+    if LexborHTMLParser is not None:
+        return _extract_text_lexbor(content)
+    return _extract_text_stdlib(content)
+
+
+def _extract_text_stdlib(content: str) -> str:
+    """Extract text with the pure-Python html.parser tokenizer"""
     extractor = HTMLTextExtractor()
     extractor.feed(content)
+    extractor.close()
+    return extractor.get_text()
+
+
+def _extract_text_lexbor(content: str) -> str:
+    """
+    Extract text with selectolax's C HTML parser
+
+    The parsed tree is replayed into HTMLTextExtractor as start tag, data and
+    end tag events, so both parsers produce the same text for well-formed
+    HTML. Malformed markup is repaired the HTML5 way first.
+    """
+    extractor = HTMLTextExtractor()
+
+    # Iterative depth-first walk; deeply nested documents must not hit the
+    # recursion limit
+    stack = [(LexborHTMLParser(content).root, False)]
+    while stack:
+        node, closing = stack.pop()
+        tag = node.tag
+        if closing:
+            extractor.handle_endtag(tag)
+        elif tag == "-text":
+            extractor.handle_data(node.text_content)
+        elif not tag.startswith("-"):  # Elements; skips comments and doctypes
+            extractor.handle_starttag(tag, [])
+            stack.append((node, True))
+            children = []
+            child = node.child
+            while child is not None:
+                children.append(child)
+                child = child.next
+            stack.extend((child, False) for child in reversed(children))
+
     return extractor.get_text()
 
 
@@ -81,11 +228,23 @@ def parse_report_file(report_path: str) -> str:
     if not path.exists():
         raise FileNotFoundError(f"Report file not found: {report_path}")
 
+    is_html = path.suffix.lower() in ['.html', '.htm']
+
     with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        # html.parser accepts the document piece by piece, so large HTML
+        # reports never have to be held in memory as one string (selectolax
+        # parses whole documents only)
+        if is_html and LexborHTMLParser is None:
+            extractor = HTMLTextExtractor()
+            while chunk := f.read(HTML_CHUNK_SIZE):
+                extractor.feed(chunk)
+            extractor.close()
+            return extractor.get_text()
+
         content = f.read()
 
     # Parse HTML files to extract text
-    if path.suffix.lower() in ['.html', '.htm']:
+    if is_html:
         content = parse_html_report(content)
 
     return content
@@ -107,6 +266,14 @@ def extract_vulnerability_details(report: str) -> Dict[str, any]:
         - keywords: Important keywords for searching
         - cwe: CWE identifier if present
     """
+    # The cached dict is shared between calls; give each caller its own lists
+    details = _extract_vulnerability_details(report)
+    return {key: list(value) if isinstance(value, list) else value for key, value in details.items()}
+
+
+@functools.lru_cache(maxsize=32)
+def _extract_vulnerability_details(report: str) -> Dict[str, any]:
+    """extract_vulnerability_details, cached for reports verified more than once"""
     details = {
         "type": None,
         "severity": None,
@@ -118,104 +285,52 @@ def extract_vulnerability_details(report: str) -> Dict[str, any]:
     }
 
     # Extract vulnerability type
-    vuln_types = [
-        "SQL Injection", "SQLi",
-        "Cross-Site Scripting", "XSS",
-        "Command Injection",
-        "Path Traversal", "Directory Traversal",
-        "Remote Code Execution", "RCE",
-        "Server-Side Request Forgery", "SSRF",
-        "XML External Entity", "XXE",
-        "Deserialization",
-        "Authentication Bypass",
-        "Authorization Bypass",
-        "Information Disclosure",
-        "Denial of Service", "DoS",
-        "Buffer Overflow",
-        "Integer Overflow",
-        "Use After Free",
-        "Race Condition",
-        "CSRF", "Cross-Site Request Forgery",
-        "Open Redirect",
-        "Insecure Direct Object Reference", "IDOR",
-        "Security Misconfiguration",
-        "Sensitive Data Exposure",
-        "Missing Access Control",
-        "Broken Authentication",
-        "Broken Access Control",
-    ]
-
+    # One lowercase copy serves both the type and the keyword scans. It costs
+    # about 1% of the extraction; a bytes.lower() copy would be cheaper, but
+    # the keyword patterns would then need bytes regexes, whose ASCII-only \b
+    # changes matches next to non-ASCII letters
     report_lower = report.lower()
-    for vuln_type in vuln_types:
-        if vuln_type.lower() in report_lower:
+    for vuln_type_lower, vuln_type_re, vuln_type in _VULN_TYPES_LOWER:
+        if vuln_type_lower in report_lower and vuln_type_re.search(report_lower):
             details["type"] = vuln_type
             break
 
     # Extract severity
-    severity_patterns = [
-        r"severity[:\s]+(\w+)",
-        r"impact[:\s]+(\w+)",
-        r"(critical|high|medium|low)\s+severity",
-    ]
-
-    for pattern in severity_patterns:
-        match = re.search(pattern, report, re.IGNORECASE)
+    for pattern in _SEVERITY_RES:
+        match = pattern.search(report)
         if match:
             details["severity"] = match.group(1).upper()
             break
 
     # Extract file paths
-    file_patterns = [
-        r"[\w\/\-\.]+\.(?:js|py|java|cpp|c|h|go|rs|php|rb|ts|tsx|jsx|sol|vy)",
-        r"(?:in|at|file)\s+[\"\']?([\w\/\-\.]+\.[\w]+)[\"\']?",
-    ]
-
-    for pattern in file_patterns:
-        matches = re.findall(pattern, report, re.IGNORECASE)
-        if isinstance(matches[0] if matches else None, tuple):
-            details["affected_files"].extend([m[0] for m in matches if m])
-        else:
-            details["affected_files"].extend(matches)
+    for pattern in _FILE_RES:
+        details["affected_files"].extend(pattern.findall(report))
 
     # Extract function names
-    function_patterns = [
-        r"function\s+(\w+)",
-        r"def\s+(\w+)",
-        r"(\w+)\s*\(",
-        r"method\s+(\w+)",
-        r"in\s+(?:the\s+)?(\w+)\s+function",
-    ]
-
-    for pattern in function_patterns:
-        matches = re.findall(pattern, report)
+    for pattern in _FUNCTION_RES:
+        matches = pattern.findall(report)
         details["affected_functions"].extend(matches)
 
-    # Remove duplicates and common noise
-    details["affected_files"] = list(set(details["affected_files"]))
-    details["affected_functions"] = list(set([
+    # Remove duplicates (in order of first mention) and common noise
+    details["affected_files"] = list(dict.fromkeys(details["affected_files"]))
+    details["affected_functions"] = list(dict.fromkeys(
         f for f in details["affected_functions"]
         if len(f) > 2 and f not in ["the", "and", "for", "with", "from"]
-    ]))
+    ))
 
     # Extract CWE
-    cwe_match = re.search(r"CWE-(\d+)", report, re.IGNORECASE)
+    cwe_match = _CWE_RE.search(report)
     if cwe_match:
         details["cwe"] = f"CWE-{cwe_match.group(1)}"
 
     # Extract keywords for searching
     # Look for important technical terms
-    keyword_patterns = [
-        r"\b(vulnerable|exploit|attack|payload|injection|bypass|overflow)\b",
-        r"\b(input|output|parameter|argument|variable)\b",
-        r"\b(validate|sanitize|encode|decode|parse|execute)\b",
-    ]
-
-    keywords_set = set()
-    for pattern in keyword_patterns:
-        matches = re.findall(pattern, report_lower)
-        keywords_set.update(matches)
+    keywords = {}
+    for pattern in _KEYWORD_RES:
+        matches = pattern.findall(report_lower)
+        keywords.update(dict.fromkeys(matches))
 
-    details["keywords"] = list(keywords_set)
+    details["keywords"] = list(keywords)
 
     # Store first 500 chars as description
     details["description"] = report[:500].strip()
@@ -236,18 +351,15 @@ def extract_code_mentions(report: str) -> List[str]:
     mentions = []
 
     # Code blocks (markdown style)
-    code_blocks = re.findall(r"```[\w]*\n(.*?)```", report, re.DOTALL)
+    code_blocks = _CODE_BLOCK_RE.findall(report)
     mentions.extend(code_blocks)
 
     # Inline code
-    inline_code = re.findall(r"`([^`]+)`", report)
+    inline_code = _INLINE_CODE_RE.findall(report)
     mentions.extend(inline_code)
 
     # File:line references
-    file_line_refs = re.findall(
-        r"([\w\/\-\.]+\.[\w]+):(\d+)",
-        report
-    )
+    file_line_refs = _FILE_LINE_RE.findall(report)
     mentions.extend([f"{f}:{l}" for f, l in file_line_refs])
 
     return mentions
@@ -1,10 +1,17 @@
 """Security utilities for input sanitization and prompt injection prevention"""
 
+import html
 import re
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
+try:
+    import re2
+except ImportError:  # optional: pip install gavel-verify[fast]
+    re2 = None
 
-# Enhanced patterns for prompt injection detection
+
+# Enhanced patterns for prompt injection detection (matched against lowercased
+# text, so they must be written in lowercase)
 SUSPICIOUS_PATTERNS = [
     # Direct instruction overrides
     r"ignore\s+(previous|all|above|prior)\s+(instructions?|prompts?|rules?|commands?)",
@@ -25,9 +32,11 @@ SUSPICIOUS_PATTERNS = [
     r"as\s+the\s+(system|administrator|developer)",
 
     # Special tokens and delimiters
-    r"<\|.*?\|>",  # Special tokens
-    r"\[INST\]",  # Instruction markers
-    r"\[/INST\]",
+    # Tokens like <|im_start|> or <|begin\u2581of\u2581sentence|>; the name is
+    # bounded so a long line full of "<|" is not rescanned from every one of them
+    r"<\|[\w\u2581]{1,40}\|>",
+    r"\[inst\]",  # Instruction markers
+    r"\[/inst\]",
     r"</s>",  # End of sequence tokens
     r"<s>",   # Start of sequence
     r"###\s*(system|instruction|human|assistant)",
@@ -46,7 +55,7 @@ SUSPICIOUS_PATTERNS = [
 
     # Jailbreak attempts
     r"do\s+anything\s+now",
-    r"DAN\s+mode",
+    r"dan\s+mode",
     r"developer\s+mode",
     r"god\s+mode",
 
@@ -68,6 +77,127 @@ SYSTEM_LEAK_PATTERNS = [
     r"REMEMBER\s*:",
 ]
 
+# Words repeated in capitals to push a verdict (aggressive detection)
+SUSPICIOUS_CAPS_WORDS = ["VALID", "INVALID", "IGNORE", "ALWAYS", "MUST", "VERDICT"]
+
+# Instruction keywords that are suspicious when repeated (aggressive detection)
+INSTRUCTION_WORDS = ["ignore", "disregard", "forget", "new instructions", "admin"]
+
+# Uses of "system" that point at prompt injection rather than a security
+# report talking about systems (aggressive detection)
+SUSPICIOUS_SYSTEM_PHRASES = [
+    "system:",
+    "system prompt",
+    "system instruction",
+    "system override",
+    "system message",
+    "as the system",
+    "new system",
+]
+
+# Lowercase fragments of the system prompt; short output lines containing one
+# are dropped in strict mode
+SYSTEM_PROMPT_FRAGMENTS = [
+    "you are gavel",
+    "your role is",
+    "critical rules:",
+    "output format:",
+    "be skeptical of",
+    "remember:",
+    "you must respond with only",
+]
+
+# Kept as separate patterns on purpose: each one starts with a literal that re
+# scans for quickly, while a single alternation of all of them tries every
+# branch at every position and is slower on benign text (the common case)
+_SUSPICIOUS_RES = tuple(re.compile(pattern) for pattern in SUSPICIOUS_PATTERNS)
+
+# All leak patterns as one alternation so redaction is a single pass over the output
+_SYSTEM_LEAK_RE = re.compile("|".join(SYSTEM_LEAK_PATTERNS), re.IGNORECASE)
+
+# A backslash escape in a pattern: \uXXXX or any escaped character
+_ESCAPE_RE = re.compile(r"\\(?:u([0-9a-fA-F]{4})|(.))")
+
+
+def _compile_re2_prefilter(patterns: List[str], ignore_case: bool = False):
+    """
+    Compile patterns into one RE2 alternation that tells whether any of them
+    matches ASCII text, or return None when RE2 is not installed
+
+    RE2 checks all patterns in a single linear-time pass, much faster than re
+    on text where nothing matches (the common case). Its character classes
+    only know ASCII, so it is only used on ASCII text, with its whitespace class
+    widened to what re matches there.
+    """
+    if re2 is None:
+        return None
+
+    def translate_escape(match):
+        if match.group(1):
+            return f"\\x{{{match.group(1)}}}"  # RE2 spells \uXXXX as \x{XXXX}
+        if match.group(2) == "s":
+            return r"[\t-\r\x1c-\x20]"  # re's \s also matches \v and \x1c-\x1f
+        return match.group(0)
+
+    alternation = "|".join(
+        f"(?:{_ESCAPE_RE.sub(translate_escape, pattern)})" for pattern in patterns
+    )
+    return re2.compile(f"(?i){alternation}" if ignore_case else alternation)
+
+
+def _may_match(prefilter, text: str) -> bool:
+    """False only when an RE2 prefilter rules out every match in text"""
+    return prefilter is None or not text.isascii() or prefilter.search(text) is not None
+
+
+# RE2 prefilters for the pattern lists (None without RE2). A Hyperscan
+# database scans a benign 400 KB report in 0.3 ms against RE2's 0.8 ms, too
+# little of a full check to justify a second, x86-only backend
+_SUSPICIOUS_RE2 = _compile_re2_prefilter(SUSPICIOUS_PATTERNS)
+_SYSTEM_LEAK_RE2 = _compile_re2_prefilter(SYSTEM_LEAK_PATTERNS, ignore_case=True)
+
+# Sensitive system directories, matched as a prefix of sanitized paths
+_SENSITIVE_DIR_RE = re.compile(r"/(?:etc|sys|proc|root|boot)")
+
+# Null bytes and invisible Unicode characters removed from user input. One
+# str.replace per character is used on purpose: it skips a string without the
+# character at memchr speed, while str.translate looks every character up in
+# the table and is many times slower on non-ASCII text. On ASCII text replace
+# returns at once for the non-ASCII characters, so only the null byte costs a
+# scan and an encode/bytes.translate/decode round trip would only add passes
+_DELETED_INPUT_CHARS = (
+    "\x00",    # Null byte
+    "\u200B",  # Zero-width space
+    "\u200C",  # Zero-width non-joiner
+    "\u200D",  # Zero-width joiner
+    "\uFEFF",  # Zero-width no-break space
+    "\u180E",  # Mongolian vowel separator
+)
+
+
+# Special tokens removed from user input
+_INPUT_SPECIAL_TOKEN_RE = re.compile(
+    r"<\|(?:endoftext|startoftext|im_start|im_end|system|user|assistant)\|>", re.IGNORECASE
+)
+
+# Longest special token in either list below (patterns are literal, so a
+# match is never longer)
+_SPECIAL_TOKEN_MAX_LEN = len("<|startoftext|>")
+
+# Runs of four or more newlines in user input
+_EXCESS_NEWLINES_RE = re.compile(r"\n{4,}")
+
+# Every byte except A-Z, deleted from ASCII text to count its capitals
+_NON_CAPITAL_BYTES = bytes(b for b in range(256) if not ord("A") <= b <= ord("Z"))
+
+# Runs of ASCII characters
+_ASCII_RUN_RE = re.compile(r"[\x00-\x7f]+")
+
+# Special tokens that must never survive in model output
+_OUTPUT_SPECIAL_TOKEN_RE = re.compile(
+    r"<\|(?:endoftext|startoftext|im_start|im_end)\|>", re.IGNORECASE
+)
+
 
 def sanitize_input(text: str, max_length: int = 500000) -> str:
     """
@@ -87,43 +217,63 @@ def sanitize_input(text: str, max_length: int = 500000) -> str:
     if len(text) > max_length:
         text = text[:max_length]
 
-    # Remove null bytes
-    text = text.replace("\x00", "")
+    # Remove null bytes and hidden Unicode characters that could be used for
+    # injection, first so they cannot split the tokens and newline runs below
+    for char in _DELETED_INPUT_CHARS:
+        text = text.replace(char, "")
+
+    # The regexes below only run when their literal start occurs in the text:
+    # a substring check is several times cheaper than a regex scan, and most
+    # reports contain neither
 
     # Normalize whitespace but preserve structure
     # Don't completely remove newlines as they're important for code structure
-    text = re.sub(r"\n{4,}", "\n\n\n", text)  # Limit consecutive newlines
-
-    # Remove potential special tokens that might confuse the model
-    special_tokens = [
-        r"<\|endoftext\|>",
-        r"<\|startoftext\|>",
-        r"<\|im_start\|>",
-        r"<\|im_end\|>",
-        r"<\|system\|>",
-        r"<\|user\|>",
-        r"<\|assistant\|>",
-    ]
-
-    for token_pattern in special_tokens:
-        text = re.sub(token_pattern, "", text, flags=re.IGNORECASE)
-
-    # Remove hidden Unicode characters that could be used for injection
-    # Zero-width characters and other invisible Unicode
-    invisible_chars = [
-        "\u200B",  # Zero-width space
-        "\u200C",  # Zero-width non-joiner
-        "\u200D",  # Zero-width joiner
-        "\uFEFF",  # Zero-width no-break space
-        "\u180E",  # Mongolian vowel separator
-    ]
-
-    for char in invisible_chars:
-        text = text.replace(char, "")
+    if "\n\n\n\n" in text:
+        text = _EXCESS_NEWLINES_RE.sub("\n\n\n", text)  # Limit consecutive newlines
+
+    # Remove potential special tokens that might confuse the model, including
+    # ones joined by removing another
+    if "<|" in text:
+        text = _remove_special_tokens(text, _INPUT_SPECIAL_TOKEN_RE)
 
     return text
 
 
+def _remove_special_tokens(text: str, token_re: "re.Pattern[str]") -> str:
+    """
+    Remove every special token matched by token_re, including tokens formed
+    when another is removed (e.g. "<|im_<|im_end|>end|>")
+
+    Runs in one left-to-right pass: text is appended to a buffer up to each
+    ">", and a token the buffer then ends with is dropped at once. Repeating
+    a regex substitution until nothing matches would instead rescan the whole
+    text once per nesting level, which is quadratic on hostile input.
+
+    Args:
+        text: Text to clean
+        token_re: Pattern matching one special token of the form <|name|>
+
+    Returns:
+        Text without special tokens
+    """
+    out: List[str] = []
+    # Every token ends in its only ">", which may follow a "|" only once
+    # the text between them has been removed
+    pieces = text.split(">")
+    for piece in pieces[:-1]:
+        out.extend(piece)
+        out.append(">")
+        if len(out) < 2 or out[-2] != "|":
+            continue
+        # A token name has no "<", so a token ending here starts at the last "<|"
+        tail = "".join(out[-_SPECIAL_TOKEN_MAX_LEN:])
+        start = tail.rfind("<|")
+        if start >= 0 and token_re.fullmatch(tail, start):
+            del out[start - len(tail):]
+    out.extend(pieces[-1])
+    return "".join(out)
+
+
 def detect_prompt_injection(text: str, aggressive: bool = True) -> Tuple[bool, Optional[str]]:
     """
     Detect potential prompt injection attempts with enhanced detection
@@ -138,26 +288,28 @@ def detect_prompt_injection(text: str, aggressive: bool = True) -> Tuple[bool, O
     text_lower = text.lower()
 
     # Check all suspicious patterns
-    for pattern in SUSPICIOUS_PATTERNS:
-        match = re.search(pattern, text_lower)
-        if match:
-            return True, f"Potential prompt injection detected: '{match.group(0)}'"
+    if _may_match(_SUSPICIOUS_RE2, text_lower):
+        for pattern in _SUSPICIOUS_RES:
+            match = pattern.search(text_lower)
+            if match:
+                return True, f"Potential prompt injection detected: '{match.group(0)}'"
 
     # Additional heuristic checks
     if aggressive:
-        # Check for excessive capitalization (shouting/emphasis for injection)
-        caps_ratio = sum(1 for c in text if c.isupper()) / max(len(text), 1)
-        if caps_ratio > 0.3 and len(text) > 50:
-            # High caps ratio might indicate trying to emphasize malicious instructions
-            suspicious_caps_words = ["VALID", "INVALID", "IGNORE", "ALWAYS", "MUST", "VERDICT"]
-            for word in suspicious_caps_words:
-                if text.count(word) > 2:
-                    return True, f"Suspicious emphasis pattern detected with word: {word}"
+        # Check for excessive capitalization (shouting/emphasis for injection).
+        # Counting the capitals is the costlier check, so it only happens once
+        # a repeated emphasis word has been found by str.count
+        if len(text) > 50:
+            repeated_words = [word for word in SUSPICIOUS_CAPS_WORDS if text.count(word) > 2]
+            if repeated_words:
+                caps_ratio = _count_uppercase(text) / len(text)
+                if caps_ratio > 0.3:
+                    # High caps ratio might indicate trying to emphasize malicious instructions
+                    return True, f"Suspicious emphasis pattern detected with word: {repeated_words[0]}"
 
         # Check for repeated instructions (trying to override)
         # Note: "system" is common in legitimate security reports, so check context
-        instruction_words = ["ignore", "disregard", "forget", "new instructions", "admin"]
-        for word in instruction_words:
+        for word in INSTRUCTION_WORDS:
             if text_lower.count(word) > 3:
                 return True, f"Excessive repetition of instruction keyword: {word}"
 
@@ -165,22 +317,29 @@ def detect_prompt_injection(text: str, aggressive: bool = True) -> Tuple[bool, O
         system_count = text_lower.count("system")
         if system_count > 10:
             # Check if it's used in prompt injection context vs legitimate security context
-            suspicious_system_usage = [
-                "system:",
-                "system prompt",
-                "system instruction",
-                "system override",
-                "system message",
-                "as the system",
-                "new system"
-            ]
-            suspicious_count = sum(text_lower.count(phrase) for phrase in suspicious_system_usage)
+            suspicious_count = sum(text_lower.count(phrase) for phrase in SUSPICIOUS_SYSTEM_PHRASES)
             if suspicious_count > 2:
                 return True, f"Suspicious usage of 'system' keyword in injection context"
 
     return False, None
 
 
+def _count_uppercase(text: str) -> int:
+    """Count the uppercase characters in text (as str.isupper would)"""
+    # ASCII capitals: delete every other byte in one C-level pass instead of
+    # calling isupper() per character. Bytes of multi-byte UTF-8 sequences are
+    # all >= 0x80, so only real A-Z characters are left (surrogatepass keeps
+    # lone surrogates from raising)
+    count = len(text.encode("utf-8", "surrogatepass").translate(None, _NON_CAPITAL_BYTES))
+
+    # Non-ASCII capitals (É, Σ, ...): isupper() on what is left once the
+    # ASCII runs are cut out
+    if not text.isascii():
+        count += sum(1 for c in _ASCII_RUN_RE.sub("", text) if c.isupper())
+
+    return count
+
+
 def sanitize_ai_output(output: str, strict: bool = True) -> str:
     """
     Sanitize AI output to prevent leakage of system prompts and internal reasoning
@@ -198,52 +357,38 @@ def sanitize_ai_output(output: str, strict: bool = True) -> str:
     if not output:
         return ""
 
-    # Check for system prompt leakage patterns
-    for pattern in SYSTEM_LEAK_PATTERNS:
-        if re.search(pattern, output, re.IGNORECASE):
-            # Found potential leak - remove or redact
-            output = re.sub(pattern, "[REDACTED]", output, flags=re.IGNORECASE)
+    # Redact system prompt leakage patterns
+    if _may_match(_SYSTEM_LEAK_RE2, output):
+        output = _SYSTEM_LEAK_RE.sub("[REDACTED]", output)
 
     if strict:
-        # Remove any lines that look like they're repeating system instructions
-        lines = output.split("\n")
-        filtered_lines = []
-
-        for line in lines:
-            line_lower = line.lower().strip()
-
-            # Skip lines that look like system prompt fragments
-            skip_line = False
-            suspicious_fragments = [
-                "you are gavel",
-                "your role is",
-                "critical rules:",
-                "output format:",
-                "be skeptical of",
-                "remember:",
-                "you must respond with only",
-            ]
-
-            for fragment in suspicious_fragments:
-                if fragment in line_lower and len(line) < 200:
-                    skip_line = True
-                    break
-
-            if not skip_line:
-                filtered_lines.append(line)
-
-        output = "\n".join(filtered_lines)
-
-    # Ensure output doesn't contain special tokens
-    special_tokens = [
-        r"<\|endoftext\|>",
-        r"<\|startoftext\|>",
-        r"<\|im_start\|>",
-        r"<\|im_end\|>",
-    ]
-
-    for token_pattern in special_tokens:
-        output = re.sub(token_pattern, "", output, flags=re.IGNORECASE)
+        # Remove any lines that look like they're repeating system instructions.
+        # Most outputs contain no fragment at all, so check the whole output
+        # once before going line by line
+        output_lower = output.lower()
+        if any(fragment in output_lower for fragment in SYSTEM_PROMPT_FRAGMENTS):
+            lines = output.split("\n")
+            filtered_lines = []
+
+            for line in lines:
+                line_lower = line.lower().strip()
+
+                # Skip lines that look like system prompt fragments
+                skip_line = False
+                for fragment in SYSTEM_PROMPT_FRAGMENTS:
+                    if fragment in line_lower and len(line) < 200:
+                        skip_line = True
+                        break
+
+                if not skip_line:
+                    filtered_lines.append(line)
+
+            output = "\n".join(filtered_lines)
+
+    # Ensure output doesn't contain special tokens, including ones joined by
+    # removing another (the model may echo a hostile report back)
+    if "<|" in output:
+        output = _remove_special_tokens(output, _OUTPUT_SPECIAL_TOKEN_RE)
 
     return output.strip()
 
@@ -272,10 +417,9 @@ def sanitize_path(path: str) -> str:
     path = path.strip()
 
     # Check for absolute paths to sensitive directories
-    sensitive_dirs = ["/etc", "/sys", "/proc", "/root", "/boot"]
-    for sensitive in sensitive_dirs:
-        if path.startswith(sensitive):
-            raise ValueError(f"Access to {sensitive} not allowed")
+    match = _SENSITIVE_DIR_RE.match(path)
+    if match:
+        raise ValueError(f"Access to {match.group(0)} not allowed")
 
     return path
 
@@ -307,16 +451,5 @@ def sanitize_for_web_display(text: str) -> str:
     Returns:
         Sanitized text
     """
-    # Basic HTML entity encoding
-    replacements = {
-        "<": "&lt;",
-        ">": "&gt;",
-        "&": "&amp;",
-        '"': "&quot;",
-        "'": "&#x27;",
-    }
-
-    for char, entity in replacements.items():
-        text = text.replace(char, entity)
-
-    return text
+    # Basic HTML entity encoding (&, <, >, " and ' as &#x27;)
+    return html.escape(text, quote=True)
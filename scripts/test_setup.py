@@ -23,7 +23,7 @@ def check_dependencies():
     required = [
         "anthropic",
         "openai",
-        "requests",
+        "httpx",
         "click",
         "rich",
         "git",  # GitPython
@@ -27,7 +27,7 @@ setup(
     install_requires=[
         "anthropic>=0.39.0",
         "openai>=1.54.0",
-        "requests>=2.31.0",
+        "httpx[http2]>=0.25.0",
         "python-dotenv>=1.0.0",
         "click>=8.1.7",
         "rich>=13.7.0",
@@ -37,6 +37,13 @@ setup(
         "pydantic>=2.5.3",
         "tenacity>=8.2.3",
     ],
+    extras_require={
+        # Faster JSON for API responses and --format json/ndjson output,
+        # a C HTML parser for .html reports, and RE2 for prompt injection scans
+        "fast": ["orjson>=3.9.0", "selectolax>=1.0.0", "google-re2>=1.1"],
+        # Accurate token counts for context budgeting
+        "tokenizer": ["tiktoken>=0.5.0"],
+    },
     entry_points={
         "console_scripts": [
             "gavel=gavel.cli:main",
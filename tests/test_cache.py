@@ -0,0 +1,71 @@
+"""Tests for the verification result cache"""
+
+import os
+import pytest
+from gavel.models import VerificationResult
+from gavel.utils import cache
+from gavel.utils.cache import cache_key, get_cached_result, store_result
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Point the cache at a temporary directory"""
+    monkeypatch.setenv("GAVEL_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_cache_key_depends_on_all_inputs():
+    """Test that every input changes the cache key"""
+    base = cache_key("report", "code", "opus-4.5", False)
+
+    assert base == cache_key("report", "code", "opus-4.5", False)
+    assert base != cache_key("report2", "code", "opus-4.5", False)
+    assert base != cache_key("report", "code2", "opus-4.5", False)
+    assert base != cache_key("report", "code", "sonnet-4.5", False)
+    assert base != cache_key("report", "code", "opus-4.5", True)
+
+
+def test_store_and_get_result():
+    """Test that a stored result round-trips"""
+    key = cache_key("report", "code", "opus-4.5", False)
+    result = VerificationResult(verdict="VALID", reasoning="Input reaches the query.")
+
+    assert get_cached_result(key) is None
+
+    store_result(key, result)
+    cached = get_cached_result(key)
+
+    assert (cached.verdict, cached.reasoning, cached.confidence, cached.poc) == (
+        result.verdict, result.reasoning, result.confidence, result.poc
+    )
+    # A reused verdict is still a new verification
+    assert cached.report_id != result.report_id
+
+
+def test_expired_entries_are_ignored_and_pruned(cache_dir):
+    """Test that entries past the age limit are misses and are deleted on the next write"""
+    old_key = cache_key("old", "code", "opus-4.5", False)
+    store_result(old_key, VerificationResult(verdict="VALID", reasoning="Old."))
+    old_path = cache_dir / f"{old_key}.json"
+    expired = os.stat(old_path).st_mtime - (cache.CACHE_MAX_AGE_DAYS + 1) * 86400
+    os.utime(old_path, (expired, expired))
+
+    assert get_cached_result(old_key) is None
+
+    new_key = cache_key("new", "code", "opus-4.5", False)
+    store_result(new_key, VerificationResult(verdict="VALID", reasoning="New."))
+    assert not old_path.exists()
+
+
+def test_oldest_entries_are_pruned_over_limit(cache_dir, monkeypatch):
+    """Test that writes keep at most CACHE_MAX_ENTRIES entries, dropping the oldest"""
+    monkeypatch.setattr(cache, "CACHE_MAX_ENTRIES", 2)
+    keys = [cache_key(f"report{i}", "code", "opus-4.5", False) for i in range(3)]
+    for i, key in enumerate(keys):
+        store_result(key, VerificationResult(verdict="VALID", reasoning="Reason."))
+        # Distinct mtimes even on coarse-grained filesystems
+        path = cache_dir / f"{key}.json"
+        mtime = os.stat(path).st_mtime - 100 + i
+        os.utime(path, (mtime, mtime))
+
+    assert sorted(p.name for p in cache_dir.glob("*.json")) == sorted(f"{key}.json" for key in keys[1:])
@@ -0,0 +1,45 @@
+"""Tests for codebase search"""
+
+from gavel.tools import grep
+from gavel.tools.grep import CodebaseIndex, _search_by_keywords
+
+
+def test_keyword_search_with_index(tmp_path):
+    """Test that indexed keyword search matches files in walk order"""
+    (tmp_path / "a.py").write_text("def handler():\n    return QUERY\n")
+    (tmp_path / "b.py").write_text("print('nothing here')\n")
+    (tmp_path / "c.js").write_text("const query = db.run(sql);\n")
+    (tmp_path / "d.md").write_text("query\n")
+
+    index = CodebaseIndex.load(str(tmp_path))
+    order = [p for p in index.paths if p.endswith((".py", ".js"))]
+    expected = [p for p in order if not p.endswith("b.py")]
+
+    matches = _search_by_keywords(str(tmp_path), ["Query"], max_files=10, index=index)
+    assert list(matches) == expected
+    assert matches[expected[0]] == index.contents[expected[0]]
+
+    assert len(_search_by_keywords(str(tmp_path), ["query", "sql"], max_files=1, index=index)) == 1
+    assert _search_by_keywords(str(tmp_path), ["missing"], max_files=10, index=index) == {}
+
+
+def test_keyword_search_ignores_matches_across_files(tmp_path):
+    """Test that a keyword spanning the end of one file and the start of the next is not a match"""
+    (tmp_path / "a.py").write_text("x = 'ab")
+    (tmp_path / "b.py").write_text("cd'")
+
+    index = CodebaseIndex.load(str(tmp_path))
+
+    assert _search_by_keywords(str(tmp_path), ["abcd"], max_files=10, index=index) == {}
+    assert _search_by_keywords(str(tmp_path), ["ab\x00cd"], max_files=10, index=index) == {}
+
+
+def test_keyword_search_on_disk_matches_decoded_text(tmp_path, monkeypatch):
+    """Test that the raw-bytes prefilter keeps files only the decoded text matches"""
+    monkeypatch.setattr(grep, "_has_ripgrep", lambda: False)
+    (tmp_path / "a.py").write_text("API_\u212aEY = load()\n", encoding="utf-8")  # Kelvin sign
+    (tmp_path / "b.py").write_text("print('nothing here')\n")
+    (tmp_path / "c.py").write_text("api_key = 1\n" + "x = 0\n" * (grep.MAX_FILE_SIZE_MB * 1024 * 1024 // 6))
+
+    matches = _search_by_keywords(str(tmp_path), ["api_key"], max_files=10, content_cache={})
+    assert list(matches) == [str(tmp_path / "a.py")]
@@ -0,0 +1,31 @@
+"""Tests for JSON encoding helpers"""
+
+import pytest
+from gavel.utils import jsonio
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Run each test with orjson (if installed) and with the stdlib fallback"""
+    if request.param == "stdlib":
+        monkeypatch.setattr(jsonio, "orjson", None)
+    elif jsonio.orjson is None:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
+def test_round_trip(backend):
+    """Test that encoding and decoding preserves the object"""
+    obj = {"verdict": "VALID", "reasoning": "Café — ok.", "poc": None, "n": [1, 2]}
+
+    assert jsonio.loads(jsonio.dumps(obj)) == obj
+    assert jsonio.loads(jsonio.dumps(obj, indent=True)) == obj
+    assert jsonio.loads(jsonio.dumps_bytes(obj)) == obj
+
+
+def test_output_format(backend):
+    """Test that both backends produce identical text"""
+    obj = {"a": 1, "b": ["é"]}
+
+    assert jsonio.dumps(obj) == '{"a":1,"b":["é"]}'
+    assert jsonio.dumps(obj, indent=True) == '{\n  "a": 1,\n  "b": [\n    "é"\n  ]\n}'
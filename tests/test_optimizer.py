@@ -0,0 +1,88 @@
+"""Tests for token optimization utilities"""
+
+from gavel.tools import optimizer
+from gavel.tools.optimizer import (
+    estimate_tokens,
+    estimate_tokens_batch,
+    extract_functions_only,
+    truncate_to_tokens,
+)
+
+
+PYTHON_SOURCE = """import os
+
+
+class Handler:
+    @login_required
+    def get(self, request):
+        if request.user:
+            return os.getcwd()
+
+        return None
+
+    def post(self, request):
+        pass
+
+
+def helper():
+    return 1
+"""
+
+
+def test_extract_python_functions_with_ast():
+    """Test that Python functions are extracted whole, decorators included"""
+    extracted = extract_functions_only(PYTHON_SOURCE, ["get", "helper"], ".py")
+
+    assert "    @login_required\n    def get(self, request):" in extracted
+    assert "        return None" in extracted
+    assert "def helper():\n    return 1" in extracted
+    assert "def post" not in extracted
+    assert "import os" not in extracted
+
+
+def test_extract_functions_fallback():
+    """Test the indentation fallback for unparseable code and unknown names"""
+    broken = "def handler(:\n    run()\ndef other():\n    pass"
+    extracted = extract_functions_only(broken, ["handler"], ".py")
+
+    assert extracted.startswith("def handler(:\n    run()")
+    assert "pass" not in extracted
+
+    assert extract_functions_only(PYTHON_SOURCE, ["missing"], ".py") == PYTHON_SOURCE
+    assert extract_functions_only(PYTHON_SOURCE, []) == PYTHON_SOURCE
+
+
+class _ByteEncoding:
+    """Stand-in for a tiktoken encoding with one token per UTF-8 byte"""
+
+    def encode_ordinary(self, text):
+        return list(text.encode("utf-8"))
+
+    def encode_ordinary_batch(self, texts, num_threads=1):
+        return [self.encode_ordinary(text) for text in texts]
+
+    def decode_bytes(self, tokens):
+        return bytes(tokens)
+
+
+def test_estimate_tokens_heuristic(monkeypatch):
+    """Test the ~4 characters per token fallback"""
+    monkeypatch.setattr(optimizer, "_encoding", lambda: None)
+
+    assert estimate_tokens("x" * 40) == 10
+    assert estimate_tokens_batch(["x" * 40, "", "abcdefgh"]) == [10, 0, 2]
+    assert truncate_to_tokens("x" * 40, 5) == "x" * 23
+
+
+def test_estimate_tokens_with_encoding(monkeypatch):
+    """Test token counting and truncation through an encoding"""
+    monkeypatch.setattr(optimizer, "_encoding", lambda: _ByteEncoding())
+
+    assert estimate_tokens("h\u00e9llo") == 6
+    assert estimate_tokens_batch(["h\u00e9llo", "ab"]) == [6, 2]
+
+    # A cut through the two-byte character drops it rather than garbling it
+    assert truncate_to_tokens("h\u00e9llo", 2) == "h"
+    assert truncate_to_tokens("h\u00e9llo", 4, strategy="front") == "llo"
+    assert truncate_to_tokens("h\u00e9llo", 6) == "h\u00e9llo"
+    assert truncate_to_tokens("h\u00e9llo", 0) == ""
@@ -1,7 +1,23 @@
 """Tests for vulnerability report parser"""
 
 import pytest
-from gavel.utils.parser import extract_vulnerability_details, extract_code_mentions
+from gavel.utils import parser
+from gavel.utils.parser import (
+    extract_vulnerability_details,
+    extract_code_mentions,
+    parse_html_report,
+    parse_report_file,
+)
+
+
+@pytest.fixture(params=["lexbor", "stdlib"])
+def html_backend(request, monkeypatch):
+    """Run each test with selectolax (if installed) and with html.parser"""
+    if request.param == "stdlib":
+        monkeypatch.setattr(parser, "LexborHTMLParser", None)
+    elif parser.LexborHTMLParser is None:
+        pytest.skip("selectolax not installed")
+    return request.param
 
 
 def test_extract_vulnerability_type():
@@ -15,6 +31,16 @@ def test_extract_vulnerability_type():
     assert details["type"] in ["SQL Injection", "SQLi"]
 
 
+def test_extract_vulnerability_type_whole_words():
+    """Test that short type names only match as words of their own"""
+    report = "Reading the source shows the SQLite resource lacks a CSRF token"
+    assert extract_vulnerability_details(report)["type"] == "CSRF"
+
+    assert extract_vulnerability_details("Two stored XSS bugs")["type"] == "XSS"
+    assert extract_vulnerability_details("Several IDORs in the API")["type"] == "IDOR"
+    assert extract_vulnerability_details("Force a resource reload")["type"] is None
+
+
 def test_extract_severity():
     """Test extraction of severity level"""
     report = """
@@ -39,6 +65,29 @@ def test_extract_affected_files():
     assert "src/auth/login.js" in details["affected_files"]
 
 
+def test_extract_details_from_long_tokens():
+    """Test that a long unbroken token (e.g. a base64 blob) does not stall extraction"""
+    blob = "QUJD" * 25000
+    report = f"Payload {blob} reaches run_query( in app/db.py"
+
+    details = extract_vulnerability_details(report)
+    assert details["affected_files"] == ["app/db.py"]
+    assert "run_query" in details["affected_functions"]
+
+
+def test_extract_details_returns_independent_copies():
+    """Test that changing returned details does not affect later calls for the same report"""
+    report = "SQL Injection in app/db.py via run_query()"
+
+    first = extract_vulnerability_details(report)
+    first["affected_files"].append("other.py")
+    first["type"] = None
+
+    second = extract_vulnerability_details(report)
+    assert second["affected_files"] == ["app/db.py"]
+    assert second["type"] == "SQL Injection"
+
+
 def test_extract_cwe():
     """Test extraction of CWE identifier"""
     report = """
@@ -71,3 +120,31 @@ def test_empty_report():
     assert details["type"] is None
     assert details["severity"] is None
     assert len(details["affected_files"]) == 0
+
+
+def test_parse_html_report(html_backend):
+    """Test HTML text extraction with both parsers"""
+    html = (
+        "<html><head><title>Report</title></head><body>"
+        "<h1>SQL   Injection</h1><p>Input reaches <b>query()</b> &amp; runs.</p>"
+        "<pre><code>db.run(sql)</code></pre><div>Line one<br>Line two</div>"
+        "<!-- hidden --></body></html>"
+    )
+
+    assert parse_html_report(html) == (
+        "Report\n\nSQL Injection\n\nInput reachesquery()& runs.\n\n"
+        "```\n\n```\ndb.run(sql)\n```\n\n```\n\nLine one\nLine two"
+    )
+
+
+def test_parse_html_report_file(html_backend, tmp_path, monkeypatch):
+    """Test that reading an HTML report in small chunks gives the same text"""
+    monkeypatch.setattr(parser, "HTML_CHUNK_SIZE", 7)
+    html = "<p>Unsanitized   input reaches <code>run(cmd)</code> &amp; then a shell.</p>"
+    report = tmp_path / "report.html"
+    report.write_text(html)
+
+    assert parse_report_file(str(report)) == parse_html_report(html)
+    assert parse_report_file(str(report)) == (
+        "Unsanitized input reaches\n```\nrun(cmd)\n```\n& then a shell."
+    )
@@ -0,0 +1,39 @@
+"""Tests for prompt building and verdict parsing"""
+
+import pytest
+from gavel.ai.prompts import parse_verdict, is_verdict_complete
+
+
+def test_parse_verdict_extracts_fields():
+    """Test extraction of verdict, reasoning and PoC"""
+    response = (
+        "VERDICT: VALID\n\n"
+        "REASONING: User input reaches the query unescaped.\n\n"
+        "POC: curl 'http://host/login?id=1 OR 1=1'"
+    )
+
+    verdict, reasoning, poc = parse_verdict(response)
+    assert verdict == "VALID"
+    assert reasoning == "User input reaches the query unescaped."
+    assert poc == "curl 'http://host/login?id=1 OR 1=1'"
+
+
+def test_parse_verdict_truncates_reasoning_to_two_sentences():
+    """Test that reasoning is cut after the second sentence"""
+    response = "VERDICT: INVALID\n\nREASONING: First point! Second point? Third point."
+
+    _, reasoning, _ = parse_verdict(response)
+    assert reasoning == "First point. Second point."
+
+
+def test_parse_verdict_defaults_to_invalid():
+    """Test conservative default when no verdict is present"""
+    verdict, reasoning, poc = parse_verdict("I am not sure about this one")
+    assert verdict == "INVALID"
+    assert poc is None
+
+
+def test_is_verdict_complete():
+    """Test detection of a finished verdict in a partial response"""
+    assert not is_verdict_complete("VERDICT: VALID\n\nREASONING: The input")
+    assert is_verdict_complete("VERDICT: VALID\n\nREASONING: The input is unescaped.\n\n")
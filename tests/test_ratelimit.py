@@ -0,0 +1,97 @@
+"""Tests for the client-side rate limiter"""
+
+import asyncio
+import pytest
+from gavel.ai import ratelimit
+from gavel.ai.ratelimit import AsyncLimiter
+
+
+class _FakeClock:
+    """Stand-in for time.monotonic where asyncio.sleep advances the clock"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _FakeClock()
+    monkeypatch.setattr(ratelimit.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(ratelimit.asyncio, "sleep", fake.sleep)
+    return fake
+
+
+def test_request_limit_waits_for_one_slot(clock):
+    """Test that the request after a full bucket waits 60/rpm seconds"""
+    limiter = AsyncLimiter(rpm=2, tpm=0)
+
+    async def run():
+        for _ in range(3):
+            await limiter.acquire(10_000)
+
+    asyncio.run(run())
+    assert clock.sleeps == [pytest.approx(30.0)]
+
+
+def test_token_limit_waits_for_missing_tokens(clock):
+    """Test that a request waits only for the tokens the bucket lacks"""
+    limiter = AsyncLimiter(rpm=0, tpm=6000)
+
+    async def run():
+        await limiter.acquire(5000)
+        await limiter.acquire(2000)  # 1000 tokens short: 10 s at 100 tokens/s
+
+    asyncio.run(run())
+    assert clock.sleeps == [pytest.approx(10.0)]
+
+
+def test_oversized_request_is_capped_at_bucket(clock):
+    """Test that a request larger than the bucket waits for a full bucket, not forever"""
+    limiter = AsyncLimiter(rpm=0, tpm=6000)
+
+    async def run():
+        await limiter.acquire(50_000)
+        await limiter.acquire(50_000)
+
+    asyncio.run(run())
+    assert clock.sleeps == [pytest.approx(60.0)]
+
+
+def test_default_limiter_has_no_token_limit(monkeypatch):
+    """Test that the token limit only applies when GAVEL_TPM is set"""
+    monkeypatch.delenv("GAVEL_TPM", raising=False)
+    ratelimit.get_limiter.cache_clear()
+    try:
+        assert ratelimit.get_limiter().tpm == 0
+
+        monkeypatch.setenv("GAVEL_TPM", "400000")
+        ratelimit.get_limiter.cache_clear()
+        assert ratelimit.get_limiter().tpm == 400000
+    finally:
+        ratelimit.get_limiter.cache_clear()
+
+
+def test_default_limiter_does_not_serialize_batch(clock, monkeypatch):
+    """Test that a batch of full-size requests under the defaults is not held back"""
+    monkeypatch.delenv("GAVEL_RPM", raising=False)
+    monkeypatch.delenv("GAVEL_TPM", raising=False)
+    ratelimit.get_limiter.cache_clear()
+    try:
+        limiter = ratelimit.get_limiter()
+
+        async def run():
+            # ~30k tokens each: an optimized codebase prompt plus max_tokens
+            await asyncio.gather(*(limiter.acquire(30_000) for _ in range(5)))
+
+        asyncio.run(run())
+        assert clock.sleeps == []
+    finally:
+        ratelimit.get_limiter.cache_clear()
@@ -0,0 +1,63 @@
+"""Tests for the provider retry policy"""
+
+import httpx
+import pytest
+from gavel.ai.anthropic import _client
+from gavel.ai.retry import is_transient, retry_after, retry_transient
+
+
+def _status_error(status, headers=None):
+    """Build the error raise_for_status would raise for status"""
+    request = httpx.Request("POST", "https://example.com")
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+def test_is_transient():
+    """Test which failures are retried"""
+    assert is_transient(_status_error(429))
+    assert is_transient(_status_error(503))
+    assert is_transient(httpx.ConnectError("refused"))
+
+    assert not is_transient(_status_error(400))
+    assert not is_transient(_status_error(401))
+    assert not is_transient(ValueError("bad response"))
+
+
+def test_retry_after_header():
+    """Test parsing of Retry-After"""
+    assert retry_after(_status_error(429, {"retry-after": "7"})) == 7.0
+    assert retry_after(_status_error(429, {"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0.0
+    assert retry_after(_status_error(429, {"retry-after": "soon"})) is None
+    assert retry_after(_status_error(429)) is None
+    assert retry_after(ValueError()) is None
+
+
+def test_retry_transient_retries_until_success():
+    """Test that transient failures are retried and permanent ones are not"""
+    calls = []
+
+    @retry_transient
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise _status_error(429, {"retry-after": "0"})
+        return "ok"
+
+    assert flaky() == "ok"
+    assert len(calls) == 3
+
+    @retry_transient
+    def broken():
+        calls.append(1)
+        raise _status_error(401)
+
+    calls.clear()
+    with pytest.raises(httpx.HTTPStatusError):
+        broken()
+    assert len(calls) == 1
+
+
+def test_anthropic_client_leaves_retries_to_retry_transient():
+    """Test that the shared client does not retry on its own under retry_transient"""
+    assert _client("test-key").max_retries == 0